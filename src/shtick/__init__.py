@@ -4,8 +4,19 @@ shtick - Shell alias manager
 
 __version__ = "1.0.0"
 
-# Export the high-level API for easy importing
-from .shtick import ShtickManager
-
 # Make it available at package level
-__all__ = ["ShtickManager"]
+__all__ = ["ShtickManager", "get_settings"]
+
+
+def __getattr__(name):
+    # Export the high-level API lazily, so CLI commands that never touch the
+    # manager don't pay for importing the config/TOML stack
+    if name == "ShtickManager":
+        from .shtick import ShtickManager
+
+        return ShtickManager
+    if name == "get_settings":
+        from .settings import get_settings
+
+        return get_settings
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
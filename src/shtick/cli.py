@@ -11,6 +11,17 @@ from shtick.display import DisplayCommands
 from shtick.logger import setup_logging
 
 
+def _non_negative_int(value: str) -> int:
+    """argparse type for counts that can't be negative"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {number}")
+    return number
+
+
 def main():
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(
@@ -106,6 +117,17 @@ def main():
         action="store_true",
         help="Show detailed line-by-line format instead of table",
     )
+    list_parser.add_argument(
+        "--limit",
+        type=_non_negative_int,
+        metavar="N",
+        help="Show at most N items (default: $SHTICK_LIST_LIMIT or 1000 on a terminal)",
+    )
+    list_parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Show every item, ignoring any limit",
+    )
 
     # Shells command
     shells_parser = subparsers.add_parser("shells", help="List supported shells")
@@ -238,7 +260,7 @@ def main():
         elif args.command == "status":
             display.status()
         elif args.command == "list":
-            display.list_config(args.long)
+            display.list_config(args.long, limit=args.limit, show_all=args.all)
         elif args.command == "shells":
             display.shells(args.long)
         elif args.command == "source":
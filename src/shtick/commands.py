@@ -4,37 +4,121 @@ Command implementations for shtick CLI - FIXED WITH CONSISTENT RETURN STATUSES
 
 import os
 import sys
-import subprocess
+import mmap
+import functools
 import logging
-from typing import Optional, List
+from typing import TYPE_CHECKING, NoReturn, Optional, List, Dict, Tuple
 
-from shtick.shtick import ShtickManager
-from shtick.config import Config
-from shtick.security import validate_assignment, validate_config_path
+if TYPE_CHECKING:
+    from shtick.shtick import ShtickManager
+
+# Heavier shtick modules (manager, config, security) are imported inside the
+# methods that need them so commands like `shtick source` start quickly
 
 logger = logging.getLogger("shtick")
 
 
+def _loader_path(shell: str) -> str:
+    """Path of the dynamic loader for a shell, under shtick's output directory"""
+    from shtick.config import Config
+
+    return os.path.join(Config.get_output_dir(), f"load_active.{shell}")
+
+
+@functools.lru_cache(maxsize=8)
+def _loader_line(shell: str) -> str:
+    """Line that sources the dynamic loader from a shell config (HOME-relative)"""
+    return f"source ~/.config/shtick/load_active.{shell}"
+
+
+# Managers for explicitly passed config files, keyed on (path, debug) and
+# tagged with the file's mtime so an edited file is re-parsed
+_MANAGER_CACHE_SIZE = 4
+_managers: Dict[Tuple[str, bool], Tuple[Optional[int], "ShtickManager"]] = {}
+
+
+@functools.lru_cache(maxsize=8)
+def _listdir_set(dirpath: str) -> frozenset:
+    """Names in a directory, listed once per command (empty if unreadable)"""
+    try:
+        return frozenset(os.listdir(dirpath))
+    except OSError:
+        return frozenset()
+
+
+def _path_exists(path: str) -> bool:
+    """Check for a file using the cached listing of its directory"""
+    dirpath, name = os.path.split(path)
+    return name in _listdir_set(dirpath)
+
+
+# Below this size a plain read() is cheaper than setting up a mapping
+_MMAP_MIN_SIZE = 64 * 1024
+
+
+def _file_contains(path: str, needle: bytes) -> bool:
+    """Check whether a file contains a byte string without decoding it"""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return False
+        if size < _MMAP_MIN_SIZE:
+            return needle in f.read()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm.find(needle) != -1
+
+
 class ShtickCommands:
     """Central command handler for shtick operations - with consistent return codes"""
 
-    def __init__(self, debug: bool = False):
+    def __init__(self, debug: bool = False, manager: Optional["ShtickManager"] = None):
         # Set up logging based on debug flag
-        if debug:
-            logging.basicConfig(
-                level=logging.DEBUG, format="%(name)s - %(levelname)s - %(message)s"
-            )
-        else:
-            logging.basicConfig(level=logging.INFO, format="%(message)s")
+        from shtick.logger import setup_logging
+
+        setup_logging(debug=debug)
+
+        self.debug = debug
+        self._manager = manager
+
+    @property
+    def manager(self) -> "ShtickManager":
+        """ShtickManager for this handler, created on first use"""
+        if self._manager is None:
+            from shtick.shtick import ShtickManager
+
+            self._manager = ShtickManager(debug=self.debug)
+        return self._manager
 
-        self.manager = ShtickManager(debug=debug)
+    def _get_manager(self, config_path: Optional[str] = None) -> "ShtickManager":
+        """Get a manager for config_path, shared while the file is unchanged"""
+        if not config_path:
+            return self.manager
 
-    def _exit_error(self, message: str, code: int = 1):
+        try:
+            mtime_ns = os.stat(config_path).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+
+        key = (config_path, self.debug)
+        cached = _managers.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        from shtick.shtick import ShtickManager
+
+        manager = ShtickManager(config_path=config_path, debug=self.debug)
+        _managers.pop(key, None)
+        if len(_managers) >= _MANAGER_CACHE_SIZE:
+            _managers.pop(next(iter(_managers)))
+        _managers[key] = (mtime_ns, manager)
+        return manager
+
+    def _exit_error(self, message: str, code: int = 1) -> NoReturn:
         """Print error message and exit with given code"""
         print(f"Error: {message}")
         sys.exit(code)
 
-    def _exit_success(self, message: str = None, code: int = 0):
+    def _exit_success(self, message: str = None, code: int = 0) -> NoReturn:
         """Print optional success message and exit with code"""
         if message:
             print(message)
@@ -42,18 +126,22 @@ class ShtickCommands:
 
     def get_current_shell(self) -> Optional[str]:
         """Use cached shell detection from Config"""
+        from shtick.config import Config
+
         return Config.get_current_shell()
 
     def validate_assignment(self, assignment: str) -> tuple[str, str]:
         """Use secure validation from security module"""
+        from shtick.security import validate_assignment
+
         return validate_assignment(assignment)
 
     def offer_auto_source(self):
         """Offer to source shtick in current shell session"""
         # Check settings first
-        from shtick.settings import Settings
+        from shtick.settings import get_settings
 
-        settings = Settings()
+        settings = get_settings()
         if not settings.behavior.auto_source_prompt:
             return
 
@@ -61,10 +149,8 @@ class ShtickCommands:
         if not current_shell or current_shell not in ["bash", "zsh", "fish"]:
             return
 
-        loader_path = os.path.expanduser(
-            f"~/.config/shtick/load_active.{current_shell}"
-        )
-        if not os.path.exists(loader_path):
+        loader_path = _loader_path(current_shell)
+        if not os.path.lexists(loader_path):
             print("Loader file not found. Run 'shtick generate' first.")
             return
 
@@ -88,7 +174,7 @@ class ShtickCommands:
             print(f'eval "$(shtick source)"')
 
         print(f"\nOr run directly:")
-        print(f"source ~/.config/shtick/load_active.{shell}")
+        print(_loader_line(shell))
 
         print("\n✨ Changes will be available in new shell sessions automatically.")
         self._show_eval_hint(shell)
@@ -119,19 +205,22 @@ class ShtickCommands:
         if current_shell not in shell_configs:
             return
 
-        loader_line = f"source ~/.config/shtick/load_active.{current_shell}"
+        loader_line = _loader_line(current_shell)
 
-        # Check if already integrated
-        for config_file in shell_configs[current_shell]:
-            expanded_path = os.path.expanduser(config_file)
-            if os.path.exists(expanded_path):
-                try:
-                    with open(expanded_path, "r") as f:
-                        content = f.read()
-                        if "shtick" in content or loader_line in content:
-                            return  # Already integrated
-                except:
-                    continue
+        # One directory listing covers all candidates in that directory;
+        # keep only the config files that actually exist
+        candidates = [os.path.expanduser(p) for p in shell_configs[current_shell]]
+        existing = [p for p in candidates if _path_exists(p)]
+
+        # Check if already integrated, stopping at the first hit
+        for expanded_path in existing:
+            try:
+                # The loader line itself contains "shtick", so one search
+                # covers both ways of being integrated
+                if _file_contains(expanded_path, b"shtick"):
+                    return  # Already integrated
+            except:
+                continue
 
         # Not integrated, offer to add
         try:
@@ -152,7 +241,7 @@ class ShtickCommands:
                         "\n✓ Integration complete! Your aliases will be available in new shell sessions."
                     )
                     print("To use them immediately in this session, run:")
-                    print(f"  source ~/.config/shtick/load_active.{current_shell}")
+                    print(f"  {loader_line}")
             else:
                 print(
                     f"\nTo manually integrate later, add this line to your {current_shell} config:"
@@ -163,12 +252,12 @@ class ShtickCommands:
 
     def _add_shell_integration(self, shell: str, config_files: List[str]) -> bool:
         """Add shtick integration to shell config"""
-        loader_line = f"source ~/.config/shtick/load_active.{shell}"
+        loader_line = _loader_line(shell)
 
         # Try to find the best config file to modify
         for config_file in config_files:
             expanded_path = os.path.expanduser(config_file)
-            if os.path.exists(expanded_path):
+            if _path_exists(expanded_path):
                 try:
                     with open(expanded_path, "a") as f:
                         f.write(f"\n# Shtick shell configuration manager\n")
@@ -187,6 +276,7 @@ class ShtickCommands:
             with open(expanded_path, "w") as f:
                 f.write(f"# Shtick shell configuration manager\n")
                 f.write(f"{loader_line}\n")
+            _listdir_set.cache_clear()  # Listing no longer reflects the new file
             print(f"✓ Created {primary_config} with shtick integration")
             return True
         except Exception as e:
@@ -198,6 +288,8 @@ class ShtickCommands:
         """Generate shell files from config"""
         try:
             if config_path:
+                from shtick.security import validate_config_path
+
                 # Validate path for security with relaxed rules for generate
                 validated_path = validate_config_path(config_path, for_generate=True)
 
@@ -206,8 +298,8 @@ class ShtickCommands:
                     print("Note: Generating from custom config file")
                     print("This will overwrite files but won't affect active groups")
 
-                # Create a new manager with custom config path
-                manager = ShtickManager(config_path=validated_path)
+                # Reuse the manager for this config path if already parsed
+                manager = self._get_manager(validated_path)
             else:
                 manager = self.manager
 
@@ -260,6 +352,8 @@ class ShtickCommands:
         except ValueError as e:
             self._exit_error(str(e))
 
+        from shtick.config import Config
+
         is_first_time = not os.path.exists(Config.get_default_config_path())
 
         # Dispatch to appropriate manager method
@@ -290,13 +384,11 @@ class ShtickCommands:
     def remove_item(self, item_type: str, group: str, search: str):
         """Remove an item from a group"""
         try:
-            # Use manager's list_items to find matches
-            all_items = self.manager.list_items(group)
-            matches = [
-                item["key"]
-                for item in all_items
-                if item["type"] == item_type and search.lower() in item["key"].lower()
-            ]
+            # Search only the requested item type within the group. Two hits
+            # are enough to tell a unique match from one needing a choice.
+            matches = self.manager.find_items(item_type, group, search, limit=2)
+            if len(matches) > 1:
+                matches = self.manager.find_items(item_type, group, search)
 
             if not matches:
                 print(
@@ -403,10 +495,8 @@ class ShtickCommands:
             print("Could not detect shell. Use --shell to specify.", file=sys.stderr)
             sys.exit(1)
 
-        loader_path = os.path.expanduser(
-            f"~/.config/shtick/load_active.{current_shell}"
-        )
-        if not os.path.exists(loader_path):
+        loader_path = _loader_path(current_shell)
+        if not os.path.lexists(loader_path):
             print(f"Loader file not found: {loader_path}", file=sys.stderr)
             print("Run 'shtick generate' first.", file=sys.stderr)
             sys.exit(1)
@@ -418,9 +508,9 @@ class ShtickCommands:
     # Settings commands
     def settings_init(self):
         """Initialize settings file with defaults"""
-        from shtick.settings import Settings
+        from shtick.settings import get_settings
 
-        settings = Settings()
+        settings = get_settings()
 
         if os.path.exists(settings._settings_path):
             try:
@@ -443,9 +533,9 @@ class ShtickCommands:
 
     def settings_show(self):
         """Show current settings"""
-        from shtick.settings import Settings
+        from shtick.settings import get_settings
 
-        settings = Settings()
+        settings = get_settings()
 
         print("Shtick Settings")
         print("=" * 50)
@@ -475,9 +565,11 @@ class ShtickCommands:
 
     def settings_set(self, key: str, value: str):
         """Set a specific setting value"""
-        from shtick.settings import Settings
+        import dataclasses
+
+        from shtick.settings import get_settings
 
-        settings = Settings()
+        settings = get_settings()
 
         # Parse the key (e.g., "generation.shells")
         parts = key.split(".")
@@ -500,7 +592,8 @@ class ShtickCommands:
         # Check if key exists
         if not hasattr(section_obj, setting_key):
             print(f"Error: Invalid key '{setting_key}' for section '{section}'")
-            print(f"Valid keys: {', '.join(vars(section_obj).keys())}")
+            valid_keys = ", ".join(f.name for f in dataclasses.fields(section_obj))
+            print(f"Valid keys: {valid_keys}")
             self._exit_error(f"Invalid key '{setting_key}'")
 
         # Parse the value based on type
@@ -558,13 +651,8 @@ class ShtickCommands:
                 self._exit_error(f"Group '{name}' already exists")
 
             # Actually create the empty group
-            from shtick.config import Config, GroupData
-
             config = self.manager._get_config()
-
-            # Add the new empty group
-            new_group = GroupData(name=name, aliases={}, env_vars={}, functions={})
-            config.groups.append(new_group)
+            config.add_group(name)
 
             # Save the config with the new empty group
             config.save()
@@ -595,32 +683,13 @@ class ShtickCommands:
             if old_name == "persistent":
                 self._exit_error("Cannot rename the 'persistent' group")
 
-            # Get the config
-            from shtick.config import Config, GroupData
-
+            # Rename the group, keeping its position in the config
             config = self.manager._get_config()
-
-            # Find the group to rename
-            old_group = None
-            for i, group in enumerate(config.groups):
-                if group.name == old_name:
-                    old_group = group
-                    # Create new group with same content but new name
-                    new_group = GroupData(
-                        name=new_name,
-                        aliases=group.aliases.copy(),
-                        env_vars=group.env_vars.copy(),
-                        functions=group.functions.copy(),
-                    )
-                    # Replace in the same position
-                    config.groups[i] = new_group
-                    break
-
-            if not old_group:
+            if not config.rename_group(old_name, new_name):
                 self._exit_error(f"Group '{old_name}' not found")
 
             # Update active groups if needed
-            active_groups = config.load_active_groups()
+            active_groups = list(config.load_active_groups())
             if old_name in active_groups:
                 active_groups.remove(old_name)
                 active_groups.append(new_name)
@@ -661,8 +730,6 @@ class ShtickCommands:
                 self._exit_error("Cannot remove the 'persistent' group")
 
             # Get the config
-            from shtick.config import Config
-
             config = self.manager._get_config()
 
             # Find the group
@@ -692,11 +759,11 @@ class ShtickCommands:
                     print("\nCancelled")
                     self._exit_success()
 
-            # Remove from groups list
-            config.groups = [g for g in config.groups if g.name != name]
+            # Remove from groups
+            config.remove_group(name)
 
             # Remove from active groups if present
-            active_groups = config.load_active_groups()
+            active_groups = list(config.load_active_groups())
             was_active = name in active_groups
             if was_active:
                 active_groups.remove(name)
@@ -3,15 +3,34 @@ Configuration parsing for shtick - REFACTORED
 """
 
 import os
+import re
+import sys
+import heapq
+import functools
 import tomllib
 import logging
-from pathlib import Path
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Union
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Tuple, Union
+
+from .fileio import (
+    atomic_write,
+    drop_sidecar,
+    read_pickle_sidecar,
+    write_pickle_sidecar,
+)
+from .settings import _HAS_TOMLI_W, _toml_fast, get_settings, tomli_w
 
 logger = logging.getLogger("shtick")
 
 
+# Single-pass escape table for TOML basic strings (backslash handled in the
+# same sweep, so no ordering concerns as with chained str.replace calls)
+_TOML_ESCAPE = str.maketrans(
+    {"\\": "\\\\", '"': '\\"', "\t": "\\t", "\r": "\\r", "\n": "\\n"}
+)
+_TOML_SPECIAL = frozenset('"\\\t\r\n')
+
+
 def escape_toml_value(value: str) -> str:
     """
     Properly escape a string value for TOML with security considerations.
@@ -28,33 +47,37 @@ def escape_toml_value(value: str) -> str:
         # But check for ''' to avoid breaking out of literal string
         if "'''" in value:
             # Fall back to basic string with escaping
-            escaped = value.replace("\\", "\\\\")  # Backslash first
-            escaped = escaped.replace('"', '\\"')  # Quotes
-            escaped = escaped.replace("\t", "\\t")  # Tab
-            escaped = escaped.replace("\r", "\\r")  # Carriage return
-            escaped = escaped.replace("\n", "\\n")  # Newline
-            return f'"{escaped}"'
+            return f'"{value.translate(_TOML_ESCAPE)}"'
         else:
             return f"'''\n{value}'''"
 
     # Check if we need basic string with escaping
-    needs_escape = any(c in value for c in ['"', "\\", "\t", "\r", "\n"])
-
-    if needs_escape:
-        # Escape special characters
-        escaped = value.replace("\\", "\\\\")  # Backslash first
-        escaped = escaped.replace('"', '\\"')  # Quotes
-        escaped = escaped.replace("\t", "\\t")  # Tab
-        escaped = escaped.replace("\r", "\\r")  # Carriage return
-        escaped = escaped.replace(
-            "\n", "\\n"
-        )  # Newline (shouldn't happen due to check above)
-        return f'"{escaped}"'
+    if not _TOML_SPECIAL.isdisjoint(value):
+        # Escape special characters in a single pass
+        return f'"{value.translate(_TOML_ESCAPE)}"'
 
     # Simple string
     return f'"{value}"'
 
 
+_BARE_KEY = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def toml_key(key: str) -> str:
+    """
+    Format a TOML key, quoting it unless it is a valid bare key.
+
+    Args:
+        key: Table or item name
+
+    Returns:
+        Key safe to use in a header or key/value line
+    """
+    if _BARE_KEY.fullmatch(key):
+        return key
+    return f'"{key.translate(_TOML_ESCAPE)}"'
+
+
 def save_config_securely(config_path: str, groups) -> None:
     """
     Save configuration to TOML file with proper escaping.
@@ -63,60 +86,112 @@ def save_config_securely(config_path: str, groups) -> None:
         config_path: Path to save config file
         groups: List of GroupData objects to save
     """
-    from pathlib import Path
-
     # Ensure directory exists
-    Path(config_path).parent.mkdir(parents=True, exist_ok=True)
+    os.makedirs(os.path.dirname(config_path) or ".", exist_ok=True)
+
+    # Use proper TOML library if available
+    if _HAS_TOMLI_W:
+        # Nested tables round-trip through tomllib unchanged. Always include
+        # the sections, even if empty, so empty groups survive a reload.
+        data = {
+            group.name: {
+                "aliases": group.aliases,
+                "env_vars": group.env_vars,
+                "functions": group.functions,
+            }
+            for group in groups
+        }
 
-    # Try to use proper TOML library if available
-    try:
-        import tomli_w
+        # Serialize up front so the file sees a single write
+        atomic_write(config_path, tomli_w.dumps(data).encode("utf-8"))
 
-        data = {}
+    else:
+        # Enhanced fallback that writes proper nested TOML structure.
+        # Build the whole document in memory and hand it to the OS in one write.
+        parts: List[str] = []
+        append = parts.append
         for group in groups:
-            group_data = {}
-            # Always include the sections, even if empty
-            group_data["aliases"] = group.aliases if group.aliases else {}
-            group_data["env_vars"] = group.env_vars if group.env_vars else {}
-            group_data["functions"] = group.functions if group.functions else {}
-            data[group.name] = group_data
-
-        with open(config_path, "wb") as f:
-            tomli_w.dump(data, f)
-
-    except ImportError:
-        # Enhanced fallback that writes proper nested TOML structure
-        with open(config_path, "w") as f:
-            # Write each group
-            for group in groups:
-                # Write main group header
-                f.write(f"[{group.name}]\n")
-
-                # Write aliases section
-                f.write(f"[{group.name}.aliases]\n")
-                for key in sorted(group.aliases.keys()):
-                    value = group.aliases[key]
-                    escaped_value = escape_toml_value(value)
-                    f.write(f"{key} = {escaped_value}\n")
-
-                # Write env_vars section
-                f.write(f"\n[{group.name}.env_vars]\n")
-                for key in sorted(group.env_vars.keys()):
-                    value = group.env_vars[key]
-                    escaped_value = escape_toml_value(value)
-                    f.write(f"{key} = {escaped_value}\n")
-
-                # Write functions section
-                f.write(f"\n[{group.name}.functions]\n")
-                for key in sorted(group.functions.keys()):
-                    value = group.functions[key]
-                    escaped_value = escape_toml_value(value)
-                    f.write(f"{key} = {escaped_value}\n")
-
-                f.write("\n")  # Empty line between groups
-
-
-@dataclass
+            # Quote the group name if needed so the header nests the way
+            # tomllib will read it back
+            name = toml_key(group.name)
+
+            # Write main group header
+            append(f"[{name}]\n")
+
+            # Write aliases section
+            append(f"[{name}.aliases]\n")
+            for key in sorted(group.aliases.keys()):
+                append(f"{toml_key(key)} = {escape_toml_value(group.aliases[key])}\n")
+
+            # Write env_vars section
+            append(f"\n[{name}.env_vars]\n")
+            for key in sorted(group.env_vars.keys()):
+                append(f"{toml_key(key)} = {escape_toml_value(group.env_vars[key])}\n")
+
+            # Write functions section
+            append(f"\n[{name}.functions]\n")
+            for key in sorted(group.functions.keys()):
+                append(
+                    f"{toml_key(key)} = {escape_toml_value(group.functions[key])}\n"
+                )
+
+            append("\n")  # Empty line between groups
+
+        atomic_write(config_path, "".join(parts))
+
+
+# Parsed groups are pickled next to the config so warm loads skip TOML
+# parsing. Bump the version whenever GroupData changes shape.
+_CACHE_VERSION = 4
+_CACHE_SUFFIX = ".cache"
+
+
+def _parse_cache_path(config_path: str) -> Optional[str]:
+    """
+    Sidecar path for a config, or None if it must not be cached.
+
+    Only shtick's own config under ~/.config/shtick gets a sidecar. Configs
+    passed explicitly (e.g. to `shtick generate <path>`) can live in shared
+    directories, where unpickling a planted sidecar would run its payload.
+    """
+    default_path = Config.get_default_config_path()
+    if os.path.abspath(config_path) != os.path.abspath(default_path):
+        return None
+    return config_path + _CACHE_SUFFIX
+
+
+def _read_parse_cache(config_path: str, key: tuple) -> Optional[dict]:
+    """Return cached groups if the sidecar matches key, else None"""
+    cache_path = _parse_cache_path(config_path)
+    if cache_path is None:
+        return None
+    groups: Optional[dict] = read_pickle_sidecar(cache_path, key)
+    return groups
+
+
+def _write_parse_cache(config_path: str, key: tuple, groups) -> None:
+    """Store parsed groups in the sidecar; failures are not fatal"""
+    cache_path = _parse_cache_path(config_path)
+    if cache_path is not None:
+        write_pickle_sidecar(cache_path, key, groups)
+
+
+def _drop_parse_cache(config_path: str) -> None:
+    """Remove the parse cache sidecar if present"""
+    cache_path = _parse_cache_path(config_path)
+    if cache_path is not None:
+        drop_sidecar(cache_path)
+
+
+# Name of the always-active group
+_PERSISTENT = sys.intern("persistent")
+
+# Item type -> GroupData field, and the TOML sections each group may carry
+_ITEM_FIELDS = {"alias": "aliases", "env": "env_vars", "function": "functions"}
+_SECTIONS = tuple(_ITEM_FIELDS.values())
+
+
+@dataclass(slots=True)
 class GroupData:
     """Holds parsed data for a single group"""
 
@@ -124,11 +199,19 @@ class GroupData:
     aliases: Dict[str, str]
     env_vars: Dict[str, str]
     functions: Dict[str, str]
+    # Lazily built (key, casefolded key) pairs per item type, for fuzzy search
+    _folded_keys: Dict[str, List[Tuple[str, str]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # Running item count, kept in step by set_item/remove_item
+    _total: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._total = len(self.aliases) + len(self.env_vars) + len(self.functions)
 
     def get_items(self, item_type: str) -> Dict[str, str]:
         """Get items dictionary for the specified type"""
-        type_map = {"alias": "aliases", "env": "env_vars", "function": "functions"}
-        attr_name = type_map.get(item_type)
+        attr_name = _ITEM_FIELDS.get(item_type)
         if not attr_name:
             raise ValueError(f"Unknown item type: {item_type}")
         return getattr(self, attr_name)
@@ -136,6 +219,9 @@ class GroupData:
     def set_item(self, item_type: str, key: str, value: str) -> None:
         """Set an item in the appropriate dictionary"""
         items = self.get_items(item_type)
+        if key not in items:
+            self._folded_keys.pop(item_type, None)
+            self._total += 1
         items[key] = value
 
     def remove_item(self, item_type: str, key: str) -> bool:
@@ -143,6 +229,8 @@ class GroupData:
         items = self.get_items(item_type)
         if key in items:
             del items[key]
+            self._folded_keys.pop(item_type, None)
+            self._total -= 1
             return True
         return False
 
@@ -156,105 +244,195 @@ class GroupData:
         items = self.get_items(item_type)
         return items.get(key)
 
+    def folded_keys(self, item_type: str) -> List[Tuple[str, str]]:
+        """Get (key, casefolded key) pairs for an item type, building them once"""
+        folded = self._folded_keys.get(item_type)
+        if folded is None:
+            folded = [(key, key.casefold()) for key in self.get_items(item_type)]
+            self._folded_keys[item_type] = folded
+        return folded
+
     @property
     def total_items(self) -> int:
         """Get total number of items in this group"""
-        return len(self.aliases) + len(self.env_vars) + len(self.functions)
+        return self._total
+
+
+def _copy_groups(groups: Dict[str, GroupData]) -> Dict[str, GroupData]:
+    """Copy groups deeply enough that edits can't leak into a shared cache"""
+    return {
+        name: GroupData(
+            name=group.name,
+            aliases=dict(group.aliases),
+            env_vars=dict(group.env_vars),
+            functions=dict(group.functions),
+        )
+        for name, group in groups.items()
+    }
+
+
+# Shells to generate for, keyed by the detected shell. Tuples are already
+# deduplicated and in generation order.
+_SHELL_FAMILIES = {
+    "bash": ("bash", "sh"),
+    "zsh": ("zsh", "bash"),
+    "fish": ("fish",),
+    "ksh": ("ksh", "bash"),
+    "dash": ("dash", "sh"),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _shell_name(shell_path: str) -> Optional[str]:
+    """Shell name for a $SHELL value; keyed on the value so changes are seen"""
+    return os.path.basename(shell_path) or None
+
+
+@functools.lru_cache(maxsize=None)
+def _shells_for(shell: str) -> tuple:
+    """Return the shells to generate for a detected shell"""
+    return _SHELL_FAMILIES.get(shell, (shell,))
 
 
 class Config:
     """Main configuration handler"""
 
     # Class variables for caching
-    _detected_shell = None
-    _active_groups_cache = None
-    _active_groups_mtime = None
-    _active_groups_file_path = None
+    _active_groups_cache: Optional[Tuple[str, ...]] = None
+    _active_groups_set: FrozenSet[str] = frozenset()
+    _active_groups_mtime: Optional[int] = None
+    _active_groups_file_path: Optional[str] = None
+    # abspath -> (cache key, groups) for configs already parsed in-process
+    _parsed_cache: Dict[str, tuple] = {}
+    # Directories already created or confirmed by ensure_config_dir
+    _dirs_ensured: Set[str] = set()
 
     def __init__(self, config_path: Optional[str] = None):
         self.config_path = config_path or self.get_default_config_path()
-        self.groups: List[GroupData] = []
+        # Keyed by name for O(1) lookups; dict order keeps file order.
+        # None means the file is known to exist but hasn't been parsed yet.
+        self._groups: Optional[Dict[str, GroupData]] = {}
 
-    @staticmethod
-    def get_default_config_path() -> str:
-        """Get the default config file location"""
-        return os.path.expanduser("~/.config/shtick/config.toml")
+    @property
+    def _group_map(self) -> Dict[str, GroupData]:
+        """Name-keyed groups, parsing the config on first use if deferred"""
+        if self._groups is None:
+            self.load()
+        groups = self._groups
+        assert groups is not None  # load() always sets it
+        return groups
+
+    @property
+    def groups(self) -> List[GroupData]:
+        """All groups, in config file order"""
+        return list(self._group_map.values())
+
+    @groups.setter
+    def groups(self, groups: List[GroupData]) -> None:
+        self._groups = {group.name: group for group in groups}
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def get_output_dir() -> str:
         """Get the output directory for generated shell files"""
         return os.path.expanduser("~/.config/shtick")
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def get_default_config_path() -> str:
+        """Get the default config file location"""
+        return os.path.join(Config.get_output_dir(), "config.toml")
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
     def get_active_groups_file() -> str:
         """Get the active groups state file path"""
-        return os.path.expanduser("~/.config/shtick/active_groups")
+        return os.path.join(Config.get_output_dir(), "active_groups")
 
-    @classmethod
-    def get_current_shell(cls) -> Optional[str]:
+    @staticmethod
+    def get_current_shell() -> Optional[str]:
         """Detect the current shell with caching"""
-        if cls._detected_shell is None:
-            shell_path = os.environ.get("SHELL", "")
-            cls._detected_shell = os.path.basename(shell_path) if shell_path else ""
-        return cls._detected_shell if cls._detected_shell else None
+        return _shell_name(os.environ.get("SHELL", ""))
 
     @classmethod
     def clear_shell_cache(cls):
         """Clear the cached shell detection (useful for testing)"""
-        cls._detected_shell = None
+        _shell_name.cache_clear()
 
     @classmethod
     def clear_all_caches(cls):
         """Clear all caches (useful for testing or forced refresh)"""
-        cls._detected_shell = None
+        _shell_name.cache_clear()
         cls._active_groups_cache = None
+        cls._active_groups_set = frozenset()
         cls._active_groups_mtime = None
         cls._active_groups_file_path = None
+        cls.get_default_config_path.cache_clear()
+        cls.get_output_dir.cache_clear()
+        cls.get_active_groups_file.cache_clear()
+        cls._parsed_cache.clear()
+        cls._dirs_ensured.clear()
+
+    @classmethod
+    def invalidate_cache(cls, config_path: str) -> None:
+        """Forget the in-process parse of a config file"""
+        cls._parsed_cache.pop(os.path.abspath(config_path), None)
 
-    def load_active_groups(self) -> List[str]:
-        """Load list of currently active groups with caching"""
+    def _cached_active_groups(self) -> Tuple[str, ...]:
+        """Return the cached active groups, reloading if the file changed"""
         active_file = self.get_active_groups_file()
 
-        # Check if we need to reload from disk
-        if os.path.exists(active_file):
-            current_mtime = os.path.getmtime(active_file)
-            if (
-                self._active_groups_cache is None
-                or self._active_groups_file_path != active_file
-                or self._active_groups_mtime != current_mtime
-            ):
-
-                logger.debug(f"Reloading active groups from {active_file}")
-                with open(active_file, "r") as f:
-                    self._active_groups_cache = [
-                        line.strip() for line in f if line.strip()
-                    ]
-                self._active_groups_mtime = current_mtime
-                self._active_groups_file_path = active_file
-            else:
-                logger.debug("Using cached active groups")
-        else:
-            # File doesn't exist, return empty list
-            self._active_groups_cache = []
-            self._active_groups_mtime = None
+        # One stat both checks existence and provides the invalidation key
+        try:
+            current_mtime = os.stat(active_file).st_mtime_ns
+        except FileNotFoundError:
+            Config._active_groups_cache = ()
+            Config._active_groups_set = frozenset()
+            Config._active_groups_mtime = None
+            Config._active_groups_file_path = active_file
+            return ()
+
+        groups = self._active_groups_cache
+        if (
+            groups is None
+            or self._active_groups_file_path != active_file
+            or self._active_groups_mtime != current_mtime
+        ):
+            logger.debug("Reloading active groups from %s", active_file)
+            with open(active_file, "r") as f:
+                groups = tuple(
+                    sys.intern(name) for name in (line.strip() for line in f) if name
+                )
+            Config._active_groups_cache = groups
+            Config._active_groups_set = frozenset(groups)
+            Config._active_groups_mtime = current_mtime
+            Config._active_groups_file_path = active_file
+
+        return groups
+
+    def load_active_groups(self) -> Tuple[str, ...]:
+        """
+        Load currently active groups with caching.
 
-        return (
-            self._active_groups_cache.copy()
-        )  # Return a copy to prevent external modification
+        The cached tuple is returned as-is; copy it to a list to modify it.
+        """
+        return self._cached_active_groups()
 
     def save_active_groups(self, active_groups: List[str]) -> None:
         """Save list of active groups to state file"""
         self.ensure_config_dir()
         active_file = self.get_active_groups_file()
 
-        with open(active_file, "w") as f:
-            for group in active_groups:
-                f.write(f"{group}\n")
+        # One write, swapped into place so a killed process can't truncate it
+        payload = "\n".join(active_groups) + "\n" if active_groups else ""
+        st = atomic_write(active_file, payload)
 
-        # Invalidate cache by updating mtime
-        self._active_groups_cache = active_groups.copy()
-        self._active_groups_mtime = os.path.getmtime(active_file)
-        self._active_groups_file_path = active_file
+        # Refresh the cache with what was just written; the rename keeps
+        # the inode's mtime, so the fstat from the write is still current
+        Config._active_groups_cache = tuple(active_groups)
+        Config._active_groups_set = frozenset(active_groups)
+        Config._active_groups_mtime = st.st_mtime_ns
+        Config._active_groups_file_path = active_file
 
     def activate_group(self, group_name: str) -> bool:
         """Activate a group. Returns True if successful."""
@@ -262,113 +440,135 @@ class Config:
         if not self.get_group(group_name):
             return False
 
-        active_groups = self.load_active_groups()
-        if group_name not in active_groups:
-            active_groups.append(group_name)
-            self.save_active_groups(active_groups)
+        # The cached list and set are read in place; a new list is only
+        # built when the state actually changes
+        active_groups = self._cached_active_groups()
+        if group_name not in self._active_groups_set:
+            self.save_active_groups([*active_groups, group_name])
 
         return True
 
     def deactivate_group(self, group_name: str) -> bool:
         """Deactivate a group. Returns True if was active."""
-        active_groups = self.load_active_groups()
-        if group_name in active_groups:
-            active_groups.remove(group_name)
-            self.save_active_groups(active_groups)
+        active_groups = self._cached_active_groups()
+        if group_name in self._active_groups_set:
+            self.save_active_groups([g for g in active_groups if g != group_name])
             return True
         return False
 
     def is_group_active(self, group_name: str) -> bool:
         """Check if a group is currently active"""
-        return group_name in self.load_active_groups()
+        self._cached_active_groups()
+        return group_name in self._active_groups_set
 
     def get_persistent_group(self) -> Optional[GroupData]:
         """Get the special 'persistent' group if it exists"""
-        return self.get_group("persistent")
+        return self.get_group(_PERSISTENT)
 
     def get_regular_groups(self) -> List[GroupData]:
         """Get all groups except 'persistent'"""
-        return [group for group in self.groups if group.name != "persistent"]
+        return [g for name, g in self._group_map.items() if name != _PERSISTENT]
 
     def ensure_config_dir(self) -> None:
         """Ensure the config directory exists"""
-        config_dir = os.path.dirname(self.config_path)
-        Path(config_dir).mkdir(parents=True, exist_ok=True)
+        config_dir = os.path.dirname(self.config_path) or "."
+        if config_dir in self._dirs_ensured:
+            return
+        os.makedirs(config_dir, exist_ok=True)
+        self._dirs_ensured.add(config_dir)
+
+    def load_deferred(self) -> None:
+        """
+        Check the config exists but postpone parsing until groups are needed.
+
+        Commands that only touch the active-groups state never pay for the
+        TOML parse.
+        """
+        if not os.path.isfile(self.config_path):
+            raise FileNotFoundError(f"Config file not found: {self.config_path}")
+        self._groups = None
 
     def load(self) -> None:
         """Load and parse the TOML configuration file"""
-        if not os.path.exists(self.config_path):
-            raise FileNotFoundError(f"Config file not found: {self.config_path}")
+        logger.debug("Loading config from: %s", self.config_path)
 
-        logger.debug(f"Loading config from: {self.config_path}")
+        # The stat doubles as the existence check and the cache key
+        try:
+            st = os.stat(self.config_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Config file not found: {self.config_path}")
+        cache_key = (_CACHE_VERSION, st.st_mtime_ns, st.st_size)
+        memo_key = os.path.abspath(self.config_path)
+
+        # Already parsed by another Config in this process and unchanged
+        memo = self._parsed_cache.get(memo_key)
+        if memo is not None and memo[0] == cache_key:
+            logger.debug("Reusing in-process parse of %s", self.config_path)
+            self._groups = _copy_groups(memo[1])
+            return
+
+        cached = _read_parse_cache(self.config_path, cache_key)
+        if cached is not None:
+            logger.debug("Using cached parse of %s", self.config_path)
+            self._parsed_cache[memo_key] = (cache_key, cached)
+            self._groups = _copy_groups(cached)
+            return
 
         with open(self.config_path, "rb") as f:
-            data = tomllib.load(f)
+            if hasattr(os, "posix_fadvise"):
+                # The whole file is read front to back; let readahead know
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            raw = f.read()
+        text = raw.decode("utf-8")
+        data = _toml_fast.loads(text) if _toml_fast else tomllib.loads(text)
 
-        logger.debug(f"Raw TOML data keys: {list(data.keys())}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Raw TOML data keys: %s", list(data.keys()))
 
-        self.groups = []
+        groups: Dict[str, GroupData] = {}
 
         # Parse groups from nested TOML structure
         for group_name, group_config in data.items():
             if not isinstance(group_config, dict):
-                logger.debug(f"Skipping non-dict value for key '{group_name}'")
+                logger.debug("Skipping non-dict value for key '%s'", group_name)
                 continue
 
-            # Initialize group data
-            group_data = {"aliases": {}, "env_vars": {}, "functions": {}}
+            # Pick out the known sections; anything else is ignored
+            sections = {}
+            for section in _SECTIONS:
+                section_data = group_config.get(section)
+                sections[section] = (
+                    section_data if isinstance(section_data, dict) else {}
+                )
 
-            # Extract each section from the group
-            for section_name, section_data in group_config.items():
-                if section_name == "aliases" and isinstance(section_data, dict):
-                    group_data["aliases"] = section_data
-                    logger.debug(f"Added {len(section_data)} aliases to '{group_name}'")
-                elif section_name == "env_vars" and isinstance(section_data, dict):
-                    group_data["env_vars"] = section_data
-                    logger.debug(
-                        f"Added {len(section_data)} env_vars to '{group_name}'"
-                    )
-                elif section_name == "functions" and isinstance(section_data, dict):
-                    group_data["functions"] = section_data
+            if logger.isEnabledFor(logging.DEBUG):
+                unknown = group_config.keys() - sections.keys()
+                if unknown:
                     logger.debug(
-                        f"Added {len(section_data)} functions to '{group_name}'"
-                    )
-                else:
-                    logger.debug(
-                        f"Unknown or invalid section '{section_name}' in group '{group_name}'"
+                        "Ignoring unknown sections in '%s': %s",
+                        group_name,
+                        sorted(unknown),
                     )
 
-            # Create GroupData object (allow empty groups)
-            new_group = GroupData(
-                name=group_name,
-                aliases=group_data["aliases"],
-                env_vars=group_data["env_vars"],
-                functions=group_data["functions"],
-            )
+            # Always add the group, even if empty. Interned names compare
+            # by identity against _PERSISTENT and the active-groups set.
+            group_name = sys.intern(group_name)
+            groups[group_name] = GroupData(name=group_name, **sections)
 
-            # Always add the group, even if empty
-            self.groups.append(new_group)
+        self._groups = groups
 
-            if new_group.total_items > 0:
-                logger.debug(
-                    f"Created group '{group_name}' with {len(group_data['aliases'])} aliases, "
-                    f"{len(group_data['env_vars'])} env_vars, {len(group_data['functions'])} functions"
-                )
-            else:
-                logger.debug(f"Created empty group '{group_name}'")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Final groups loaded: %s (total: %d)", list(groups), len(groups)
+            )
 
-        logger.debug(
-            f"Final groups loaded: {[g.name for g in self.groups]} (total: {len(self.groups)})"
-        )
+        _write_parse_cache(self.config_path, cache_key, groups)
+        self._parsed_cache[memo_key] = (cache_key, _copy_groups(groups))
 
     def save(self) -> None:
         """Save the current configuration back to TOML file with secure escaping"""
         # Check if we should backup
-        from .settings import Settings
-
-        settings = Settings()
-
-        if settings.behavior.backup_on_save and os.path.exists(self.config_path):
+        if get_settings().behavior.backup_on_save and os.path.exists(self.config_path):
             # Create automatic backup
             from datetime import datetime
 
@@ -381,39 +581,41 @@ class Config:
             import shutil
 
             shutil.copy2(self.config_path, backup_path)
-            logger.debug(f"Created automatic backup: {backup_path}")
-
-            # Clean up old auto backups (keep last 10)
-            auto_backups = sorted(
-                [
-                    f
-                    for f in os.listdir(backup_dir)
-                    if f.startswith("config_auto_") and f.endswith(".toml")
+            logger.debug("Created automatic backup: %s", backup_path)
+
+            # Clean up old auto backups (keep last 10). Timestamped names
+            # sort chronologically, so only the newest 10 need tracking.
+            with os.scandir(backup_dir) as entries:
+                auto_backups = [
+                    entry.name
+                    for entry in entries
+                    if entry.name.startswith("config_auto_")
+                    and entry.name.endswith(".toml")
                 ]
-            )
             if len(auto_backups) > 10:
-                for old_backup in auto_backups[:-10]:
-                    os.remove(os.path.join(backup_dir, old_backup))
-
-        # Save normally
-        save_config_securely(self.config_path, self.groups)
+                keep = set(heapq.nlargest(10, auto_backups))
+                for old_backup in auto_backups:
+                    if old_backup not in keep:
+                        os.remove(os.path.join(backup_dir, old_backup))
+
+        # Save normally. Resolve any deferred parse, then drop the parse
+        # cache so a failed write can never leave a stale sidecar behind.
+        groups = self._group_map
+        self.invalidate_cache(self.config_path)
+        _drop_parse_cache(self.config_path)
+        save_config_securely(self.config_path, groups.values())
 
     def get_group(self, group_name: str) -> Optional[GroupData]:
         """Get a specific group by name"""
-        for group in self.groups:
-            if group.name == group_name:
-                return group
-        return None
+        return self._group_map.get(group_name)
 
     def add_group(self, group_name: str) -> GroupData:
         """Add a new group or return existing one"""
-        existing = self.get_group(group_name)
-        if existing:
-            return existing
-
-        new_group = GroupData(name=group_name, aliases={}, env_vars={}, functions={})
-        self.groups.append(new_group)
-        return new_group
+        group = self._group_map.get(group_name)
+        if group is None:
+            group = GroupData(name=group_name, aliases={}, env_vars={}, functions={})
+            self._group_map[group_name] = group
+        return group
 
     def add_item(self, item_type: str, group_name: str, key: str, value: str) -> None:
         """Add an alias, env var, or function to a group"""
@@ -427,27 +629,33 @@ class Config:
             return False
         return group.remove_item(item_type, key)
 
-    def find_items(
+    def iter_matching_items(
         self, item_type: str, group_name: str, search_term: str
-    ) -> List[str]:
-        """Find items matching a search term (for fuzzy removal)"""
+    ) -> Iterator[str]:
+        """Lazily yield items matching a search term (for fuzzy removal)"""
         group = self.get_group(group_name)
         if not group:
-            return []
+            return
 
-        items = group.get_items(item_type)
-        # Simple fuzzy matching - contains search term
-        return [item for item in items.keys() if search_term.lower() in item.lower()]
+        # Simple fuzzy matching - contains search term (case-insensitive)
+        needle = search_term.casefold()
+        for item, folded in group.folded_keys(item_type):
+            if needle in folded:
+                yield item
+
+    def find_items(
+        self, item_type: str, group_name: str, search_term: str
+    ) -> List[str]:
+        """Find items matching a search term (for fuzzy removal)"""
+        return list(self.iter_matching_items(item_type, group_name, search_term))
 
     def get_all_shells_to_generate(self) -> List[str]:
         """Get list of shells to generate files for based on user settings"""
-        from .settings import Settings
-
-        settings = Settings()
+        settings = get_settings()
 
         # If shells are explicitly set in settings, use those
         if settings.generation.shells:
-            logger.debug(f"Using shells from settings: {settings.generation.shells}")
+            logger.debug("Using shells from settings: %s", settings.generation.shells)
             return settings.generation.shells
 
         # Otherwise auto-detect based on current shell
@@ -457,22 +665,29 @@ class Config:
             return ["bash", "zsh", "fish"]  # Common defaults
 
         # Include current shell and close relatives
-        shell_families = {
-            "bash": ["bash", "sh"],
-            "zsh": ["zsh", "bash"],
-            "fish": ["fish"],
-            "ksh": ["ksh", "bash"],
-            "dash": ["dash", "sh"],
-        }
-
-        shells = shell_families.get(current_shell, [current_shell])
+        shells = list(_shells_for(current_shell))
         logger.debug(
-            f"Auto-detected shells based on current shell '{current_shell}': {shells}"
+            "Auto-detected shells based on current shell '%s': %s",
+            current_shell,
+            shells,
         )
-        return list(set(shells))  # Remove duplicates
+        return shells
 
     def remove_group(self, group_name: str) -> bool:
         """Remove a group by name. Returns True if removed."""
-        initial_count = len(self.groups)
-        self.groups = [g for g in self.groups if g.name != group_name]
-        return len(self.groups) < initial_count
+        return self._group_map.pop(group_name, None) is not None
+
+    def rename_group(self, old_name: str, new_name: str) -> bool:
+        """Rename a group in place. Returns False if old is missing or new exists."""
+        if old_name not in self._group_map or new_name in self._group_map:
+            return False
+
+        # Rebuild so the renamed group keeps its position in the file
+        renamed: Dict[str, GroupData] = {}
+        for name, group in self._group_map.items():
+            if name == old_name:
+                group.name = new_name
+                name = new_name
+            renamed[name] = group
+        self._groups = renamed
+        return True
@@ -4,12 +4,39 @@ Display commands for shtick CLI - handles listing, status, and informational out
 
 import os
 import sys
-import logging
-from shtick.config import Config
-from shtick.shells import get_supported_shells
-from shtick.shtick import ShtickManager
+import functools
+from typing import Optional, Set, Tuple
 
-logger = logging.getLogger("shtick")
+# Item cap for `shtick list` on a terminal, overridable via SHTICK_LIST_LIMIT
+DEFAULT_LIST_LIMIT = 1000
+
+
+@functools.lru_cache(maxsize=1)
+def _terminal_width() -> int:
+    """Terminal width, looked up once per process; falls back to $COLUMNS or 80"""
+    try:
+        return os.get_terminal_size(1).columns
+    except OSError:
+        try:
+            return int(os.environ.get("COLUMNS", 80))
+        except ValueError:
+            return 80
+
+
+def _default_list_limit():
+    """Row cap to apply when --limit isn't given, or None for no cap"""
+    if not sys.stdout.isatty():
+        return None  # Pipes and files get everything
+    try:
+        limit = int(os.environ.get("SHTICK_LIST_LIMIT", DEFAULT_LIST_LIMIT))
+    except ValueError:
+        return DEFAULT_LIST_LIMIT
+    return limit if limit >= 0 else DEFAULT_LIST_LIMIT
+
+
+def _display_order(item):
+    """Sort key for listing: persistent first, then group, type and key"""
+    return (item["group"] != "persistent", item["group"], item["type"], item["key"])
 
 
 class DisplayCommands:
@@ -17,17 +44,26 @@ class DisplayCommands:
 
     def __init__(self, debug: bool = False):
         # Set up logging
-        if debug:
-            logging.basicConfig(
-                level=logging.DEBUG, format="%(name)s - %(levelname)s - %(message)s"
-            )
-        else:
-            logging.basicConfig(level=logging.INFO, format="%(message)s")
+        from shtick.logger import setup_logging
+
+        setup_logging(debug=debug)
+
+        self.debug = debug
+        self._manager = None
 
-        self.manager = ShtickManager(debug=debug)
+    @property
+    def manager(self):
+        """ShtickManager for this handler, created on first use"""
+        if self._manager is None:
+            from shtick.shtick import ShtickManager
+
+            self._manager = ShtickManager(debug=self.debug)
+        return self._manager
 
     def get_current_shell(self):
         """Use cached shell detection from Config"""
+        from shtick.config import Config
+
         return Config.get_current_shell()
 
     def status(self):
@@ -40,55 +76,56 @@ class DisplayCommands:
             print("  shtick alias ll='ls -la'")
             return
 
-        print("Shtick Status")
-        print("=" * 40)
+        lines = ["Shtick Status", "=" * 40]
+        add = lines.append
 
         # Show current shell integration status
         if status["current_shell"]:
-            print(f"Current shell: {status['current_shell']}")
+            add(f"Current shell: {status['current_shell']}")
             if status["loader_exists"]:
-                print(f"Loader file: ✓ exists")
+                add("Loader file: ✓ exists")
             else:
-                print(f"Loader file: ✗ missing (run 'shtick generate')")
-        print()
+                add("Loader file: ✗ missing (run 'shtick generate')")
+        add("")
 
         # Show persistent group
         if status["persistent_items"] > 0:
-            print(f"Persistent (always active): {status['persistent_items']} items")
+            add(f"Persistent (always active): {status['persistent_items']} items")
         else:
-            print("Persistent: No items")
+            add("Persistent: No items")
 
-        print()
+        add("")
 
         # Show regular groups
         if status["available_groups"]:
-            print("Available Groups:")
+            add("Available Groups:")
             active_set = set(status["active_groups"])
+            items_per_group = status["items_per_group"]
             for group_name in status["available_groups"]:
-                # Get item count for this group
-                items = self.manager.list_items(group_name)
-                item_count = len(items)
+                item_count = items_per_group[group_name]
                 status_str = "ACTIVE" if group_name in active_set else "inactive"
-                print(f"  {group_name}: {item_count} items ({status_str})")
+                add(f"  {group_name}: {item_count} items ({status_str})")
         else:
-            print("No regular groups configured")
+            add("No regular groups configured")
 
-        print()
+        add("")
 
         # Show summary
         if status["active_groups"]:
-            print(f"Currently active: {', '.join(status['active_groups'])}")
+            add(f"Currently active: {', '.join(status['active_groups'])}")
         else:
-            print("No groups currently active")
+            add("No groups currently active")
 
-        print()
-        print("Quick commands:")
-        print("  shtick alias ll='ls -la'              # Add persistent alias")
-        print("  shtick activate <group>               # Activate group")
-        print('  eval "$(shtick source)"               # Load changes now')
+        add("")
+        add("Quick commands:")
+        add("  shtick alias ll='ls -la'              # Add persistent alias")
+        add("  shtick activate <group>               # Activate group")
+        add('  eval "$(shtick source)"               # Load changes now')
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
-    def list_config(self, long_format: bool = False):
-        """List current configuration"""
+    def list_config(self, long_format: bool = False, limit=None, show_all=False):
+        """List current configuration, capped at limit items unless show_all"""
         items = self.manager.list_items()
 
         if not items:
@@ -99,7 +136,28 @@ class DisplayCommands:
             print("  shtick activate work                  # Activate 'work' group")
             return
 
-        # Group items by group name
+        # Cap very large listings before doing any layout work. Sort first so
+        # the rows kept are the first ones in display order, and summarize the
+        # whole configuration rather than just the rows shown.
+        summary: Optional[Tuple[int, int, Set[str]]] = None
+        if not show_all:
+            if limit is None:
+                limit = _default_list_limit()
+            if limit is not None and limit < len(items):
+                print(
+                    f"{len(items)} items - showing first {limit}, "
+                    f"use --all to see all\n"
+                )
+                items.sort(key=_display_order)
+                summary = self._summarize(items)
+                items = items[:limit]
+
+        # Display based on format
+        if not long_format:
+            self._print_tabular_list(items, summary)
+            return
+
+        # Group items by group name (only the detailed view needs this)
         groups_data = {}
         for item in items:
             group_name = item["group"]
@@ -118,103 +176,164 @@ class DisplayCommands:
             elif item["type"] == "function":
                 groups_data[group_name]["functions"][item["key"]] = item["value"]
 
-        # Display based on format
-        if long_format:
+        if groups_data:
             self._print_detailed_list(groups_data)
-        else:
-            self._print_tabular_list(items)
+        if summary is not None:
+            self._print_summary(*summary, detailed=True)
 
     def _print_detailed_list(self, groups_data):
         """Print detailed line-by-line list format"""
-        # Show persistent group first if it exists
-        if "persistent" in groups_data:
-            print("Group: persistent (always active)")
-            self._print_group_items_detailed(groups_data["persistent"])
-            print()
-            del groups_data["persistent"]
+        lines = []
 
-        # Show regular groups
-        for group_name, group_data in sorted(groups_data.items()):
+        # Show persistent group first if it exists
+        persistent = groups_data.get("persistent")
+        if persistent is not None:
+            lines.append("Group: persistent (always active)")
+            self._format_group_items_detailed(persistent, lines)
+            lines.append("")
+
+        # Show regular groups, leaving the caller's dict untouched
+        for group_name in sorted(groups_data):
+            if group_name == "persistent":
+                continue
+            group_data = groups_data[group_name]
             status = " (ACTIVE)" if group_data["active"] else " (inactive)"
-            print(f"Group: {group_name}{status}")
-            self._print_group_items_detailed(group_data)
-            print()
+            lines.append(f"Group: {group_name}{status}")
+            self._format_group_items_detailed(group_data, lines)
+            lines.append("")
+
+        # One write for the whole listing rather than one per line
+        sys.stdout.write("\n".join(lines) + "\n")
 
-    def _print_group_items_detailed(self, group_data):
-        """Print items for a single group in detailed format"""
+    def _format_group_items_detailed(self, group_data, lines):
+        """Append detailed-format lines for a single group's items to lines"""
         if group_data["aliases"]:
-            print(f"  Aliases ({len(group_data['aliases'])}):")
+            lines.append(f"  Aliases ({len(group_data['aliases'])}):")
             for key, value in group_data["aliases"].items():
-                print(f"    {key} = {value}")
+                lines.append(f"    {key} = {value}")
         if group_data["env_vars"]:
-            print(f"  Environment Variables ({len(group_data['env_vars'])}):")
+            lines.append(f"  Environment Variables ({len(group_data['env_vars'])}):")
             for key, value in group_data["env_vars"].items():
-                print(f"    {key} = {value}")
+                lines.append(f"    {key} = {value}")
         if group_data["functions"]:
-            print(f"  Functions ({len(group_data['functions'])}):")
+            lines.append(f"  Functions ({len(group_data['functions'])}):")
             for key, value in group_data["functions"].items():
-                print(f"    {key} = {value}")
+                lines.append(f"    {key} = {value}")
 
-    def _print_tabular_list(self, items):
-        """Print compact tabular list format"""
+    @staticmethod
+    def _summarize(items):
+        """Return (total, active count, inactive group names) for items"""
+        active_items = 0
+        inactive_groups = set()
+        for item in items:
+            if item["active"]:
+                active_items += 1
+            elif item["group"] != "persistent":
+                inactive_groups.add(item["group"])
+        return len(items), active_items, inactive_groups
+
+    def _print_tabular_list(self, items, summary=None):
+        """
+        Print compact tabular list format.
+
+        summary is a (total, active count, inactive groups) tuple for when
+        items is a capped slice; by default it is computed from items.
+        """
         if not items:
+            # A cap of 0 leaves nothing to tabulate, but still report totals
+            if summary is not None:
+                self._print_summary(*summary)
             return
 
-        # Calculate column widths
-        max_group = max(max(len(item["group"]) for item in items), 5)  # "Group"
-        max_type = max(max(len(item["type"]) for item in items), 4)  # "Type"
-        max_key = max(max(len(item["key"]) for item in items), 3)  # "Key"
-        max_value = max(
-            max(min(len(item["value"]), 50) for item in items), 5
-        )  # "Value" (limited)
-        max_status = max(
-            max(len("ACTIVE" if item["active"] else "inactive") for item in items), 6
-        )  # "Status"
-
-        # Print header
-        header = f"{'Group':<{max_group}} {'Type':<{max_type}} {'Key':<{max_key}} {'Value':<{max_value}} {'Status':<{max_status}}"
-        print(header)
-        print("-" * len(header))
-
-        # Sort items for better display (persistent first, then by group, then by type)
-        def sort_key(item):
-            group_order = 0 if item["group"] == "persistent" else 1
-            return (group_order, item["group"], item["type"], item["key"])
-
-        sorted_items = sorted(items, key=sort_key)
-
-        # Print items
-        for item in sorted_items:
-            # Truncate long values with ellipsis
+        # Calculate column widths and summary totals in one pass, seeding the
+        # widths with the header widths. The same pass builds plain tuples
+        # whose natural order is the display order (persistent first, then
+        # by group, type and key), so they sort without a key function.
+        max_group, max_type, max_key, max_value, max_status = 5, 4, 3, 5, 6
+        active_items = 0
+        inactive_groups = set()
+        rows = []
+        append = rows.append
+        for item in items:
+            group = item["group"]
+            item_type = item["type"]
+            key = item["key"]
             value = item["value"]
-            display_value = (
-                value if len(value) <= max_value else value[: max_value - 3] + "..."
+            n = len(group)
+            if n > max_group:
+                max_group = n
+            n = len(item_type)
+            if n > max_type:
+                max_type = n
+            n = len(key)
+            if n > max_key:
+                max_key = n
+            if max_value < 50:  # Values are truncated at 50, so stop there
+                n = len(value)
+                if n > max_value:
+                    max_value = n if n < 50 else 50
+            if item["active"]:
+                active_items += 1
+                status = "ACTIVE"
+            else:
+                max_status = 8  # len("inactive")
+                status = "inactive"
+                if group != "persistent":
+                    inactive_groups.add(group)
+            append((group != "persistent", group, item_type, key, value, status))
+
+        rows.sort()
+
+        # Pad each column with str.ljust and join, rather than running a
+        # format spec for every row
+        pad = str.ljust
+        join = " ".join
+        header = join(
+            (
+                pad("Group", max_group),
+                pad("Type", max_type),
+                pad("Key", max_key),
+                pad("Value", max_value),
+                pad("Status", max_status),
             )
-            status = "ACTIVE" if item["active"] else "inactive"
-            print(
-                f"{item['group']:<{max_group}} {item['type']:<{max_type}} "
-                f"{item['key']:<{max_key}} {display_value:<{max_value}} {status:<{max_status}}"
+        )
+        lines = [header, "-" * len(header)]
+        append = lines.append
+
+        # Format rows, truncating long values with an ellipsis
+        for _, group, item_type, key, value, status in rows:
+            if len(value) > max_value:
+                value = value[: max_value - 3] + "..."
+            append(
+                join(
+                    (
+                        pad(group, max_group),
+                        pad(item_type, max_type),
+                        pad(key, max_key),
+                        pad(value, max_value),
+                        pad(status, max_status),
+                    )
+                )
             )
 
-        # Print summary
-        self._print_summary(items)
+        sys.stdout.write("\n".join(lines) + "\n")
 
-    def _print_summary(self, items):
-        """Print summary information"""
+        # Print summary
+        if summary is None:
+            summary = (len(items), active_items, inactive_groups)
         print()
-        total_items = len(items)
-        active_items = len([item for item in items if item["active"]])
+        self._print_summary(*summary)
+
+    def _print_summary(
+        self, total_items, active_items, inactive_groups, detailed=False
+    ):
+        """Print summary information below an already separated listing"""
         print(f"Total: {total_items} items ({active_items} active)")
 
         # Show available commands
-        print()
-        print("Use 'shtick list -l' for detailed view")
-
-        # Get inactive groups
-        inactive_groups = set()
-        for item in items:
-            if not item["active"] and item["group"] != "persistent":
-                inactive_groups.add(item["group"])
+        if not detailed:
+            print()
+            print("Use 'shtick list -l' for detailed view")
 
         if inactive_groups:
             print(f"Activate groups with: shtick activate <group>")
@@ -222,6 +341,8 @@ class DisplayCommands:
 
     def shells(self, long_format: bool = False):
         """List supported shells"""
+        from shtick.shells import get_supported_shells
+
         shells = sorted(get_supported_shells())
 
         if long_format:
@@ -237,13 +358,7 @@ class DisplayCommands:
             print("No shells configured")
             return
 
-        # Try to get terminal width, fallback to 80
-        try:
-            import shutil
-
-            terminal_width = shutil.get_terminal_size().columns
-        except:
-            terminal_width = 80
+        terminal_width = _terminal_width()
 
         # Find the longest shell name
         max_shell_length = max(len(shell) for shell in shells)
@@ -253,10 +368,9 @@ class DisplayCommands:
         columns = max(1, terminal_width // column_width)
         rows = (len(shells) + columns - 1) // columns
 
-        print(f"Supported shells ({len(shells)} total):")
-        print()
+        lines = [f"Supported shells ({len(shells)} total):", ""]
 
-        # Print shells in columns
+        # Lay shells out in columns, filling down each column first
         for row in range(rows):
             line = ""
             for col in range(columns):
@@ -264,4 +378,6 @@ class DisplayCommands:
                 if index < len(shells):
                     shell = shells[index]
                     line += f"{shell:<{column_width}}"
-            print(line.rstrip())
+            lines.append(line.rstrip())
+
+        sys.stdout.write("\n".join(lines) + "\n")
@@ -0,0 +1,127 @@
+"""
+File writing helpers for shtick
+"""
+
+import os
+import pickle
+import logging
+from typing import Any, Optional, Union
+
+logger = logging.getLogger("shtick")
+
+
+def atomic_write(
+    path: str, content: Union[str, bytes], mode: Optional[int] = None
+) -> os.stat_result:
+    """
+    Write content to a file atomically.
+
+    The data is written to a temporary file next to the target, which then
+    replaces the target with os.replace, so a crash never leaves a torn file.
+    Symlinked targets are resolved first so the link itself is preserved,
+    as are the permissions of an existing target unless mode is given.
+
+    Args:
+        path: Destination file path
+        content: Text or bytes to write
+        mode: Permission bits to set on the file instead
+
+    Returns:
+        Stat of the written file, taken from the open descriptor
+    """
+    target = os.path.realpath(path)
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    open_mode = "wb" if isinstance(content, bytes) else "w"
+
+    try:
+        with open(tmp_path, open_mode) as f:
+            f.write(content)
+            if mode is not None:
+                os.fchmod(f.fileno(), mode)
+            else:
+                try:
+                    os.fchmod(f.fileno(), os.stat(target).st_mode & 0o7777)
+                except FileNotFoundError:
+                    pass  # New file - keep umask defaults
+            f.flush()
+            st = os.fstat(f.fileno())
+        os.replace(tmp_path, target)
+        return st
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def is_private_file(st: os.stat_result) -> bool:
+    """
+    Check that a file belongs to the current user and only they can write it.
+
+    Used before trusting cache files that get unpickled.
+
+    Args:
+        st: Stat of the file, ideally from its open descriptor
+
+    Returns:
+        True if owned by us and not group- or world-writable
+    """
+    getuid = getattr(os, "getuid", None)
+    if getuid is not None and st.st_uid != getuid():
+        return False
+    return not st.st_mode & 0o022
+
+
+def read_pickle_sidecar(path: str, key: tuple) -> Optional[Any]:
+    """
+    Load a cached object from a pickle sidecar file.
+
+    The sidecar holds a pickled key followed by the pickled object. It is
+    only unpickled if it is private to the current user, since unpickling a
+    planted file would run its payload.
+
+    Args:
+        path: Sidecar file path
+        key: Value the stored key must equal (e.g. version, mtime and size)
+
+    Returns:
+        The cached object, or None if missing, stale, untrusted or unreadable
+    """
+    try:
+        with open(path, "rb") as f:
+            if not is_private_file(os.fstat(f.fileno())):
+                logger.debug("Ignoring cache not private to this user: %s", path)
+                return None
+            if pickle.load(f) != key:
+                return None
+            return pickle.load(f)
+    except Exception:
+        # Missing, stale or unreadable sidecar - the caller parses the source
+        return None
+
+
+def write_pickle_sidecar(path: str, key: tuple, obj: Any) -> None:
+    """
+    Store an object in a pickle sidecar file; failures are not fatal.
+
+    The file is written owner-only so read_pickle_sidecar accepts it.
+
+    Args:
+        path: Sidecar file path
+        key: Key to store ahead of the object
+        obj: Object to cache
+    """
+    try:
+        payload = pickle.dumps(key) + pickle.dumps(obj)
+        atomic_write(path, payload, mode=0o600)
+    except Exception as e:
+        logger.debug("Could not write cache %s: %s", path, e)
+
+
+def drop_sidecar(path: str) -> None:
+    """Remove a sidecar file if present"""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
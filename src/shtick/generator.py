@@ -4,7 +4,6 @@ Shell file generator for shtick
 
 import os
 import logging
-from pathlib import Path
 from typing import Dict, List, Set
 from shtick.config import GroupData, Config
 from shtick.shells import get_shell_syntax
@@ -34,7 +33,7 @@ class Generator:
                 # Otherwise create a temporary one just for getting shells
                 config = Config()
                 self._shells_to_generate = config.get_all_shells_to_generate()
-            logger.debug(f"Will generate files for shells: {self._shells_to_generate}")
+            logger.debug("Will generate files for shells: %s", self._shells_to_generate)
         return self._shells_to_generate
 
     def set_config_for_shells(self, config: Config) -> None:
@@ -46,16 +45,16 @@ class Generator:
     def ensure_output_dir(self, group_name: str) -> str:
         """Ensure output directory exists and return the path"""
         output_dir = os.path.join(self.output_base_dir, group_name)
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        os.makedirs(output_dir, exist_ok=True)
         return output_dir
 
     def generate_for_group(self, group: GroupData) -> None:
         """Generate all shell files for a single group"""
-        logger.info(f"Processing group: {group.name}")
+        logger.info("Processing group: %s", group.name)
 
         # Skip if group is empty
         if group.total_items == 0:
-            logger.debug(f"Skipping empty group: {group.name}")
+            logger.debug("Skipping empty group: %s", group.name)
             return
 
         # Prepare all content for the group
@@ -90,7 +89,10 @@ class Generator:
             return
 
         logger.debug(
-            f"Generating {shell_name} file for group {group_name} ({total_items} items)"
+            "Generating %s file for group %s (%d items)",
+            shell_name,
+            group_name,
+            total_items,
         )
 
         # Create consolidated file
@@ -106,8 +108,8 @@ class Generator:
             if content["alias"]:
                 f.write(f"# Aliases ({len(content['alias'])})\n")
                 for key, value in sorted(content["alias"].items()):
-                    # Use the callable format functions with proper escaping
-                    line = shell_syntax.alias_fmt(key, value)
+                    # Render through the shell template with proper escaping
+                    line = shell_syntax.fmt_alias(key, value)
                     f.write(line)
                 f.write("\n")
 
@@ -115,8 +117,8 @@ class Generator:
             if content["env"]:
                 f.write(f"# Environment Variables ({len(content['env'])})\n")
                 for key, value in sorted(content["env"].items()):
-                    # Use the callable format functions with proper escaping
-                    line = shell_syntax.env_fmt(key, value)
+                    # Render through the shell template with proper escaping
+                    line = shell_syntax.fmt_env(key, value)
                     f.write(line)
                 f.write("\n")
 
@@ -124,8 +126,8 @@ class Generator:
             if content["function"]:
                 f.write(f"# Functions ({len(content['function'])})\n")
                 for key, value in sorted(content["function"].items()):
-                    # Use the callable format functions with proper escaping
-                    line = shell_syntax.function_fmt(key, value)
+                    # Render through the shell template with proper escaping
+                    line = shell_syntax.fmt_function(key, value)
                     f.write(line)
                 f.write("\n")
 
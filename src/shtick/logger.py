@@ -4,6 +4,10 @@ Logging configuration for shtick
 
 import logging
 import sys
+from typing import Dict
+
+# Debug mode each logger was last configured with by setup_logging
+_configured: Dict[str, bool] = {}
 
 
 def setup_logging(debug: bool = False, name: str = "shtick") -> logging.Logger:
@@ -19,6 +23,10 @@ def setup_logging(debug: bool = False, name: str = "shtick") -> logging.Logger:
     """
     logger = logging.getLogger(name)
 
+    # Already configured for this mode - nothing to redo
+    if logger.handlers and _configured.get(name) == debug:
+        return logger
+
     # Clear any existing handlers to avoid duplicates
     logger.handlers.clear()
 
@@ -42,5 +50,6 @@ def setup_logging(debug: bool = False, name: str = "shtick") -> logging.Logger:
 
     # Prevent propagation to root logger
     logger.propagate = False
+    _configured[name] = debug
 
     return logger
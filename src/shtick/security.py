@@ -4,12 +4,20 @@ Security validation functions for shtick - FIXED FOR GENERATE COMMAND
 
 import os
 import re
+import string
+import functools
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple
 
-# Pre-compiled regex for key validation - used frequently
+# Pre-compiled regex for key validation, kept for callers that want the
+# pattern itself; validate_key uses the character sets below
 KEY_VALIDATION_PATTERN = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_-]*$")
 
+# Same rule as KEY_VALIDATION_PATTERN as plain character sets, which is
+# cheaper than running the regex for the short keys shtick deals with
+_KEY_FIRST_CHARS = frozenset(string.ascii_letters + "_")
+_KEY_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+
 # System directories that should be blocked
 FORBIDDEN_SYSTEM_PATHS = (
     "/etc",
@@ -33,7 +41,7 @@ def validate_key(key: str) -> None:
     Raises:
         ValueError: If key format is invalid
     """
-    if not KEY_VALIDATION_PATTERN.match(key):
+    if not key or key[0] not in _KEY_FIRST_CHARS or not _KEY_CHARS.issuperset(key):
         raise ValueError(
             f"Invalid key '{key}': must start with letter/underscore and contain only alphanumeric, underscore, hyphen"
         )
@@ -62,6 +70,10 @@ def validate_config_path(path: str, for_generate: bool = False) -> str:
     """
     Validate and sanitize config path for security.
 
+    The resolution and location checks are memoized on the absolute path
+    together with the working and home directories they depend on; the
+    generate command's existence check runs on every call.
+
     Args:
         path: Path to validate
         for_generate: If True, use relaxed validation for generate command
@@ -78,53 +90,21 @@ def validate_config_path(path: str, for_generate: bool = False) -> str:
         return Config.get_default_config_path()
 
     try:
-        # Resolve to absolute path
-        resolved = Path(path).resolve()
-        resolved_str = str(resolved)
-
-        # Check for directory traversal attempts
+        # Check for directory traversal attempts before touching the disk
         if ".." in path:
             raise ValueError("Directory traversal detected")
 
-        # Ensure .toml extension
-        if resolved.suffix != ".toml":
-            raise ValueError("Config file must have .toml extension")
-
-        # For generate command, use relaxed validation
-        if for_generate:
-            # Just ensure the file exists and isn't in system directories
-            if not resolved.exists():
-                raise ValueError("Config file not found")
-
-            # Still block system directories
-            if any(
-                resolved_str.startswith(forbidden)
-                for forbidden in FORBIDDEN_SYSTEM_PATHS
-            ):
-                raise ValueError("Access to system directories is forbidden")
-
-            return resolved_str
-
-        # For other commands, use strict validation
-        # Block system directories
-        if any(
-            resolved_str.startswith(forbidden) for forbidden in FORBIDDEN_SYSTEM_PATHS
-        ):
-            raise ValueError("Access to system directories is forbidden")
-
-        # Ensure it's under user's home or current directory
-        home = Path.home()
-        cwd = Path.cwd()
-
-        # Check both the original home and current home (for tests)
-        original_home = os.environ.get("SHTICK_ORIGINAL_HOME")
-        if original_home:
-            original_home_path = Path(original_home)
-            if resolved.is_relative_to(original_home_path):
-                return resolved_str
-
-        if not (resolved.is_relative_to(home) or resolved.is_relative_to(cwd)):
-            raise ValueError("Config path must be under home or current directory")
+        resolved_str = _validate_resolved_path(
+            os.path.abspath(path),
+            for_generate,
+            os.getcwd(),
+            os.path.expanduser("~"),
+            os.environ.get("SHTICK_ORIGINAL_HOME"),
+        )
+
+        # For generate command, the file must exist right now
+        if for_generate and not os.path.exists(resolved_str):
+            raise ValueError("Config file not found")
 
         return resolved_str
 
@@ -132,6 +112,51 @@ def validate_config_path(path: str, for_generate: bool = False) -> str:
         raise ValueError(f"Invalid config path: {e}")
 
 
+@functools.lru_cache(maxsize=64)
+def _validate_resolved_path(
+    abs_path: str,
+    for_generate: bool,
+    cwd: str,
+    home: str,
+    original_home: Optional[str],
+) -> str:
+    """
+    Resolve abs_path and check where it points; failures are not cached.
+
+    Every input the checks depend on is part of the key, so a chdir or a
+    different HOME gets a fresh validation.
+    """
+    resolved = Path(abs_path).resolve()
+    resolved_str = str(resolved)
+
+    # Ensure .toml extension
+    if resolved.suffix != ".toml":
+        raise ValueError("Config file must have .toml extension")
+
+    # Block system directories
+    if resolved_str.startswith(FORBIDDEN_SYSTEM_PATHS):
+        raise ValueError("Access to system directories is forbidden")
+
+    # For generate command, use relaxed validation
+    if for_generate:
+        return resolved_str
+
+    # For other commands, ensure it's under user's home or current directory.
+    # Check both the original home and current home (for tests).
+    if original_home and resolved.is_relative_to(original_home):
+        return resolved_str
+
+    if not (resolved.is_relative_to(home) or resolved.is_relative_to(cwd)):
+        raise ValueError("Config path must be under home or current directory")
+
+    return resolved_str
+
+
+def clear_path_cache() -> None:
+    """Forget memoized config path validations (useful for testing)"""
+    _validate_resolved_path.cache_clear()
+
+
 def validate_assignment(assignment: str) -> Tuple[str, str]:
     """
     Validate key=value assignment format and return validated key, value.
@@ -3,16 +3,44 @@ Settings management for shtick
 """
 
 import os
-import tomllib
 import logging
-from pathlib import Path
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field
+import functools
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, field, fields
+
+from .fileio import (
+    atomic_write,
+    drop_sidecar,
+    read_pickle_sidecar,
+    write_pickle_sidecar,
+)
+
+# Optional TOML backends, imported once here for both settings and the config
+# loader. Parsing falls back to tomllib when rtoml isn't installed.
+try:
+    import rtoml as _toml_fast
+except ImportError:
+    _toml_fast = None
+
+# Optional TOML writer; a hand-rolled writer is used when it isn't installed
+try:
+    import tomli_w
+
+    _HAS_TOMLI_W = True
+except ImportError:
+    tomli_w = None
+    _HAS_TOMLI_W = False
 
 logger = logging.getLogger("shtick")
 
+# Parsed settings are pickled next to settings.toml, keyed on its mtime and
+# size, so warm starts skip TOML parsing. Bump the version if the cached
+# payload changes shape.
+_CACHE_VERSION = 1
+_CACHE_SUFFIX = ".cache"
+
 
-@dataclass
+@dataclass(slots=True)
 class GenerationSettings:
     """Settings for file generation"""
 
@@ -21,7 +49,7 @@ class GenerationSettings:
     consolidate_files: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class BehaviorSettings:
     """Settings for shtick behavior"""
 
@@ -31,6 +59,27 @@ class BehaviorSettings:
     interactive_mode: bool = True
 
 
+@dataclass(slots=True)
+class PerformanceSettings:
+    """Settings for caching and batching"""
+
+    cache_ttl: int = 300  # Seconds
+    lazy_load: bool = True
+    batch_operations: bool = True
+
+
+# Settings file tables, each bound to the Settings attribute of the same
+# name, with the field names of its dataclass in declaration order
+_SECTIONS: Dict[str, Tuple[str, ...]] = {
+    section: tuple(f.name for f in fields(section_cls))
+    for section, section_cls in (
+        ("generation", GenerationSettings),
+        ("behavior", BehaviorSettings),
+        ("performance", PerformanceSettings),
+    )
+}
+
+
 class Settings:
     """Manages shtick settings and preferences"""
 
@@ -38,101 +87,120 @@ class Settings:
     _instance = None
     _loaded = False
 
+    # Set on the instance once __init__ has run, so repeat Settings() calls
+    # return straight away
+    _init_done = False
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
     def __init__(self):
-        if not self._loaded:
-            self.generation = GenerationSettings()
-            self.behavior = BehaviorSettings()
-            self._settings_path = self.get_settings_path()
-            self._load()
-            Settings._loaded = True
+        if self._init_done:
+            return
+
+        self.generation = GenerationSettings()
+        self.behavior = BehaviorSettings()
+        self.performance = PerformanceSettings()
+        self._settings_path = self.get_settings_path()
+        self._load()
+        self._init_done = True
+        Settings._loaded = True
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def get_settings_path() -> str:
         """Get the settings file path"""
         return os.path.expanduser("~/.config/shtick/settings.toml")
 
     def _load(self) -> None:
         """Load settings from file if it exists"""
-        if not os.path.exists(self._settings_path):
+        # The stat doubles as the existence check and the cache key
+        try:
+            st = os.stat(self._settings_path)
+        except OSError:
             logger.debug("No settings file found, using defaults")
             return
+        cache_key = (_CACHE_VERSION, st.st_mtime_ns, st.st_size)
 
         try:
-            logger.debug(f"Loading settings from {self._settings_path}")
-            with open(self._settings_path, "rb") as f:
-                data = tomllib.load(f)
-
-            # Load generation settings
-            if "generation" in data:
-                gen_data = data["generation"]
-                self.generation.shells = gen_data.get("shells", [])
-                self.generation.parallel = gen_data.get("parallel", False)
-                self.generation.consolidate_files = gen_data.get(
-                    "consolidate_files", True
-                )
+            data = read_pickle_sidecar(self._settings_path + _CACHE_SUFFIX, cache_key)
+            if data is not None:
+                logger.debug("Using cached settings for %s", self._settings_path)
+            else:
+                logger.debug("Loading settings from %s", self._settings_path)
+                with open(self._settings_path, "rb") as f:
+                    text = f.read().decode("utf-8")
+                if _toml_fast:
+                    data = _toml_fast.loads(text)
+                else:
+                    import tomllib
 
-            # Load behavior settings
-            if "behavior" in data:
-                beh_data = data["behavior"]
-                self.behavior.auto_source_prompt = beh_data.get(
-                    "auto_source_prompt", True
+                    data = tomllib.loads(text)
+                write_pickle_sidecar(
+                    self._settings_path + _CACHE_SUFFIX, cache_key, data
                 )
-                self.behavior.check_conflicts = beh_data.get("check_conflicts", True)
-                self.behavior.backup_on_save = beh_data.get("backup_on_save", False)
-                self.behavior.interactive_mode = beh_data.get("interactive_mode", True)
+
+            # Bind each table onto its section's fields; keys missing from
+            # the file keep their defaults and unknown keys are ignored
+            for section, names in _SECTIONS.items():
+                table = data.get(section)
+                if table:
+                    section_obj = getattr(self, section)
+                    for name in names:
+                        if name in table:
+                            setattr(section_obj, name, table[name])
 
             logger.debug("Settings loaded successfully")
 
         except Exception as e:
-            logger.warning(f"Failed to load settings: {e}, using defaults")
+            logger.warning("Failed to load settings: %s, using defaults", e)
 
     def save(self) -> None:
         """Save current settings to file"""
         # Ensure directory exists
         os.makedirs(os.path.dirname(self._settings_path), exist_ok=True)
+        drop_sidecar(self._settings_path + _CACHE_SUFFIX)
 
-        # Build settings dictionary
-        settings_dict = {
-            "generation": {
-                "shells": self.generation.shells,
-                "parallel": self.generation.parallel,
-                "consolidate_files": self.generation.consolidate_files,
-            },
-            "behavior": {
-                "auto_source_prompt": self.behavior.auto_source_prompt,
-                "check_conflicts": self.behavior.check_conflicts,
-                "backup_on_save": self.behavior.backup_on_save,
-                "interactive_mode": self.behavior.interactive_mode,
-            },
-        }
-
-        # Write TOML file
-        with open(self._settings_path, "w") as f:
-            f.write("# Shtick settings file\n")
-            f.write("# Generated automatically - edit as needed\n\n")
+        # Build settings dictionary from the section fields
+        settings_dict = {}
+        for section, names in _SECTIONS.items():
+            section_obj = getattr(self, section)
+            settings_dict[section] = {
+                name: getattr(section_obj, name) for name in names
+            }
 
+        # Serialize the whole file up front so it goes out in a single write
+        header = (
+            "# Shtick settings file\n# Generated automatically - edit as needed\n\n"
+        )
+        if _HAS_TOMLI_W:
+            content = header + tomli_w.dumps(settings_dict)
+        else:
+            parts = [header]
+            append = parts.append
             for section, values in settings_dict.items():
-                f.write(f"[{section}]\n")
+                append(f"[{section}]\n")
                 for key, value in values.items():
                     if isinstance(value, bool):
-                        f.write(f"{key} = {str(value).lower()}\n")
+                        append(f"{key} = {str(value).lower()}\n")
                     elif isinstance(value, list):
                         if value:  # Non-empty list
-                            f.write(f"{key} = {repr(value)}\n")
+                            append(f"{key} = {repr(value)}\n")
                         else:
-                            f.write(f"{key} = []  # Empty = auto-detect\n")
+                            append(f"{key} = []  # Empty = auto-detect\n")
                     else:
-                        f.write(f"{key} = {value}\n")
-                f.write("\n")
+                        append(f"{key} = {value}\n")
+                append("\n")
+            content = "".join(parts)
+
+        atomic_write(self._settings_path, content.encode("utf-8"))
 
     def create_default_settings_file(self) -> None:
         """Create a default settings file with comments"""
         os.makedirs(os.path.dirname(self._settings_path), exist_ok=True)
+        drop_sidecar(self._settings_path + _CACHE_SUFFIX)
 
         content = """# Shtick settings file
 # This file controls various shtick behaviors and optimizations
@@ -154,15 +222,36 @@ check_conflicts = true
 backup_on_save = false
 # Enable interactive prompts
 interactive_mode = true
+
+[performance]
+# Seconds cached data is considered fresh
+cache_ttl = 300
+# Defer loading data until it is first needed
+lazy_load = true
+# Group multiple changes into a single save
+batch_operations = true
 """
 
-        with open(self._settings_path, "w") as f:
-            f.write(content)
+        atomic_write(self._settings_path, content)
 
-        logger.info(f"Created default settings file at {self._settings_path}")
+        logger.info("Created default settings file at %s", self._settings_path)
 
     @classmethod
     def reset(cls):
         """Reset the singleton instance (useful for testing)"""
         cls._instance = None
         cls._loaded = False
+        cls.get_settings_path.cache_clear()
+
+
+def get_settings() -> Settings:
+    """
+    Get the shared Settings instance.
+
+    Returns the already-loaded singleton directly, constructing it only on
+    first use or after Settings.reset().
+    """
+    instance = Settings._instance
+    if instance is None or not Settings._loaded:
+        instance = Settings()
+    return instance
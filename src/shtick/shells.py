@@ -2,24 +2,28 @@
 Shell syntax definitions for shtick - SECURE VERSION
 """
 
-import shlex
-from typing import Callable
+import string
+import functools
+from types import MappingProxyType
 
+# Characters shlex.quote leaves alone (its [\w@%+=:,./-] under re.ASCII);
+# most names and simple values are made of nothing else
+_SAFE_CHARS = frozenset(string.ascii_letters + string.digits + "_@%+=:,./-")
 
-class ShellSyntax:
-    """Holds syntax patterns for different shell types with secure escaping"""
-
-    def __init__(
-        self,
-        name: str,
-        alias_fmt: Callable[[str, str], str],
-        env_fmt: Callable[[str, str], str],
-        function_fmt: Callable[[str, str], str],
-    ):
-        self.name = name
-        self.alias_fmt = alias_fmt
-        self.env_fmt = env_fmt
-        self.function_fmt = function_fmt
+
+def _fast_quote(s: str) -> str:
+    """
+    Quote a string for POSIX shells, exactly as shlex.quote does.
+
+    Safe strings come back unchanged after a set-membership check instead of
+    a regex search; anything else is wrapped in single quotes, with embedded
+    single quotes spelled '"'"'.
+    """
+    if not s:
+        return "''"
+    if _SAFE_CHARS.issuperset(s):
+        return s
+    return "'" + s.replace("'", "'\"'\"'") + "'"
 
 
 # Helper function for safe function body handling
@@ -31,112 +35,159 @@ def escape_function_body(body: str) -> str:
     return body.replace("'", "'\"'\"'")
 
 
-# Shell syntax table - using secure escaping with lambdas
-SHELLS = {
-    "bash": ShellSyntax(
-        "bash",
-        alias_fmt=lambda k, v: f"alias {shlex.quote(k)}={shlex.quote(v)}\n",
-        env_fmt=lambda k, v: f"export {shlex.quote(k)}={shlex.quote(v)}\n",
-        function_fmt=lambda k, v: f"{shlex.quote(k)}() {{\n    {escape_function_body(v)}\n}}\n",
-    ),
-    "zsh": ShellSyntax(
-        "zsh",
-        alias_fmt=lambda k, v: f"alias {shlex.quote(k)}={shlex.quote(v)}\n",
-        env_fmt=lambda k, v: f"export {shlex.quote(k)}={shlex.quote(v)}\n",
-        function_fmt=lambda k, v: f"{shlex.quote(k)}() {{\n    {escape_function_body(v)}\n}}\n",
-    ),
+class ShellSyntax:
+    """
+    Holds syntax templates for a shell type with secure escaping.
+
+    Templates are str.format strings with three placeholders: {k} is the
+    shlex-quoted name, {v} the shlex-quoted value and {b} the value escaped
+    as a function body. Only the placeholders a template uses are computed.
+    """
+
+    __slots__ = (
+        "name",
+        "alias_tmpl",
+        "env_tmpl",
+        "func_tmpl",
+        "_alias_fields",
+        "_env_fields",
+        "_func_fields",
+    )
+
+    def __init__(self, name: str, alias_tmpl: str, env_tmpl: str, func_tmpl: str):
+        self.name = name
+        self.alias_tmpl = alias_tmpl
+        self.env_tmpl = env_tmpl
+        self.func_tmpl = func_tmpl
+        self._alias_fields = self._fields(alias_tmpl)
+        self._env_fields = self._fields(env_tmpl)
+        self._func_fields = self._fields(func_tmpl)
+
+    @staticmethod
+    def _fields(tmpl: str):
+        """Which of the value placeholders ({v}, {b}) a template uses"""
+        return "{v}" in tmpl, "{b}" in tmpl
+
+    @staticmethod
+    def _fill(tmpl: str, fields, k: str, v: str) -> str:
+        uses_v, uses_b = fields
+        return tmpl.format(
+            k=_fast_quote(k),
+            v=_fast_quote(v) if uses_v else "",
+            b=escape_function_body(v) if uses_b else "",
+        )
+
+    def _render_uncached(self, kind: str, k: str, v: str) -> str:
+        if kind == "alias":
+            return self._fill(self.alias_tmpl, self._alias_fields, k, v)
+        if kind == "env":
+            return self._fill(self.env_tmpl, self._env_fields, k, v)
+        return self._fill(self.func_tmpl, self._func_fields, k, v)
+
+    def fmt_alias(self, k: str, v: str) -> str:
+        """Render an alias definition line"""
+        return _render(self, "alias", k, v)
+
+    def fmt_env(self, k: str, v: str) -> str:
+        """Render an environment variable export line"""
+        return _render(self, "env", k, v)
+
+    def fmt_function(self, k: str, v: str) -> str:
+        """Render a function definition"""
+        return _render(self, "function", k, v)
+
+
+@functools.lru_cache(maxsize=8192)
+def _render(syntax: ShellSyntax, kind: str, k: str, v: str) -> str:
+    """
+    Memoized rendering of one item for one shell.
+
+    Regenerating, or emitting the same item again, skips the quoting and
+    formatting. Keyed on the ShellSyntax instance itself, which hashes by
+    identity, so syntaxes built outside SHELLS are cached safely too.
+    """
+    return syntax._render_uncached(kind, k, v)
+
+
+# Bourne-style shells all share one syntax instance (and with it their
+# rendered-line cache entries); its name is the family, not a table key
+_POSIX_SYNTAX = ShellSyntax(
+    "posix",
+    alias_tmpl="alias {k}={v}\n",
+    env_tmpl="export {k}={v}\n",
+    func_tmpl="{k}() {{\n    {b}\n}}\n",
+)
+
+# Shell syntax table - str.format templates, quoted at render time
+_SHELLS = {
+    "bash": _POSIX_SYNTAX,
+    "zsh": _POSIX_SYNTAX,
     "fish": ShellSyntax(
         "fish",
-        alias_fmt=lambda k, v: f"alias {shlex.quote(k)} {shlex.quote(v)}\n",
-        env_fmt=lambda k, v: f"set -x {shlex.quote(k)} {shlex.quote(v)}\n",
-        function_fmt=lambda k, v: f"function {shlex.quote(k)}\n    {escape_function_body(v)}\nend\n",
-    ),
-    "ksh": ShellSyntax(
-        "ksh",
-        alias_fmt=lambda k, v: f"alias {shlex.quote(k)}={shlex.quote(v)}\n",
-        env_fmt=lambda k, v: f"export {shlex.quote(k)}={shlex.quote(v)}\n",
-        function_fmt=lambda k, v: f"{shlex.quote(k)}() {{\n    {escape_function_body(v)}\n}}\n",
-    ),
-    "mksh": ShellSyntax(
-        "mksh",
-        alias_fmt=lambda k, v: f"alias {shlex.quote(k)}={shlex.quote(v)}\n",
-        env_fmt=lambda k, v: f"export {shlex.quote(k)}={shlex.quote(v)}\n",
-        function_fmt=lambda k, v: f"{shlex.quote(k)}() {{\n    {escape_function_body(v)}\n}}\n",
-    ),
-    "yash": ShellSyntax(
-        "yash",
-        alias_fmt=lambda k, v: f"alias {shlex.quote(k)}={shlex.quote(v)}\n",
-        env_fmt=lambda k, v: f"export {shlex.quote(k)}={shlex.quote(v)}\n",
-        function_fmt=lambda k, v: f"{shlex.quote(k)}() {{\n    {escape_function_body(v)}\n}}\n",
-    ),
-    "dash": ShellSyntax(
-        "dash",
-        alias_fmt=lambda k, v: f"alias {shlex.quote(k)}={shlex.quote(v)}\n",
-        env_fmt=lambda k, v: f"export {shlex.quote(k)}={shlex.quote(v)}\n",
-        function_fmt=lambda k, v: f"{shlex.quote(k)}() {{\n    {escape_function_body(v)}\n}}\n",
-    ),
+        alias_tmpl="alias {k} {v}\n",
+        env_tmpl="set -x {k} {v}\n",
+        func_tmpl="function {k}\n    {b}\nend\n",
+    ),
+    "ksh": _POSIX_SYNTAX,
+    "mksh": _POSIX_SYNTAX,
+    "yash": _POSIX_SYNTAX,
+    "dash": _POSIX_SYNTAX,
     "csh": ShellSyntax(
         "csh",
-        alias_fmt=lambda k, v: f"alias {shlex.quote(k)} {shlex.quote(v)}\n",
-        env_fmt=lambda k, v: f"setenv {shlex.quote(k)} {shlex.quote(v)}\n",
-        function_fmt=lambda k, v: f"# csh doesn't support functions - skipping {shlex.quote(k)}\n",
+        alias_tmpl="alias {k} {v}\n",
+        env_tmpl="setenv {k} {v}\n",
+        func_tmpl="# csh doesn't support functions - skipping {k}\n",
     ),
     "tcsh": ShellSyntax(
         "tcsh",
-        alias_fmt=lambda k, v: f"alias {shlex.quote(k)} {shlex.quote(v)}\n",
-        env_fmt=lambda k, v: f"setenv {shlex.quote(k)} {shlex.quote(v)}\n",
-        function_fmt=lambda k, v: f"# tcsh doesn't support functions - skipping {shlex.quote(k)}\n",
+        alias_tmpl="alias {k} {v}\n",
+        env_tmpl="setenv {k} {v}\n",
+        func_tmpl="# tcsh doesn't support functions - skipping {k}\n",
     ),
     "xonsh": ShellSyntax(
         "xonsh",
-        alias_fmt=lambda k, v: f"aliases[{shlex.quote(k)}] = {shlex.quote(v)}\n",
-        env_fmt=lambda k, v: f"${{{shlex.quote(k)}}} = {shlex.quote(v)}\n",
-        function_fmt=lambda k, v: f"def {shlex.quote(k)}():\n    return {shlex.quote(v)}\n",
+        alias_tmpl="aliases[{k}] = {v}\n",
+        env_tmpl="${{{k}}} = {v}\n",
+        func_tmpl="def {k}():\n    return {v}\n",
     ),
     "elvish": ShellSyntax(
         "elvish",
-        alias_fmt=lambda k, v: f"fn {shlex.quote(k)} {{ {escape_function_body(v)} }}\n",
-        env_fmt=lambda k, v: f"E:{shlex.quote(k)} = {shlex.quote(v)}\n",
-        function_fmt=lambda k, v: f"fn {shlex.quote(k)} {{ {escape_function_body(v)} }}\n",
+        alias_tmpl="fn {k} {{ {b} }}\n",
+        env_tmpl="E:{k} = {v}\n",
+        func_tmpl="fn {k} {{ {b} }}\n",
     ),
     "rc": ShellSyntax(
         "rc",
-        alias_fmt=lambda k, v: f"fn {shlex.quote(k)} {{ {escape_function_body(v)} }}\n",
-        env_fmt=lambda k, v: f"{shlex.quote(k)}={shlex.quote(v)}\n",
-        function_fmt=lambda k, v: f"fn {shlex.quote(k)} {{ {escape_function_body(v)} }}\n",
+        alias_tmpl="fn {k} {{ {b} }}\n",
+        env_tmpl="{k}={v}\n",
+        func_tmpl="fn {k} {{ {b} }}\n",
     ),
     "es": ShellSyntax(
         "es",
-        alias_fmt=lambda k, v: f"fn-{shlex.quote(k)} = {{ {escape_function_body(v)} }}\n",
-        env_fmt=lambda k, v: f"{shlex.quote(k)}={shlex.quote(v)}\n",
-        function_fmt=lambda k, v: f"fn-{shlex.quote(k)} = {{ {escape_function_body(v)} }}\n",
+        alias_tmpl="fn-{k} = {{ {b} }}\n",
+        env_tmpl="{k}={v}\n",
+        func_tmpl="fn-{k} = {{ {b} }}\n",
     ),
     "nushell": ShellSyntax(
         "nushell",
-        alias_fmt=lambda k, v: f"alias {shlex.quote(k)} = {escape_function_body(v)}\n",
-        env_fmt=lambda k, v: f"let-env {shlex.quote(k)} = {shlex.quote(v)}\n",
-        function_fmt=lambda k, v: f"def {shlex.quote(k)} [] {{ {escape_function_body(v)} }}\n",
+        alias_tmpl="alias {k} = {b}\n",
+        env_tmpl="let-env {k} = {v}\n",
+        func_tmpl="def {k} [] {{ {b} }}\n",
     ),
     "powershell": ShellSyntax(
         "powershell",
-        alias_fmt=lambda k, v: f"Set-Alias -Name {shlex.quote(k)} -Value {shlex.quote(v)}\n",
-        env_fmt=lambda k, v: f"$env:{shlex.quote(k)} = {shlex.quote(v)}\n",
-        function_fmt=lambda k, v: f"function {shlex.quote(k)} {{ {escape_function_body(v)} }}\n",
-    ),
-    "oil": ShellSyntax(
-        "oil",
-        alias_fmt=lambda k, v: f"alias {shlex.quote(k)}={shlex.quote(v)}\n",
-        env_fmt=lambda k, v: f"export {shlex.quote(k)}={shlex.quote(v)}\n",
-        function_fmt=lambda k, v: f"{shlex.quote(k)}() {{\n    {escape_function_body(v)}\n}}\n",
-    ),
-    "default": ShellSyntax(
-        "default",
-        alias_fmt=lambda k, v: f"alias {shlex.quote(k)}={shlex.quote(v)}\n",
-        env_fmt=lambda k, v: f"export {shlex.quote(k)}={shlex.quote(v)}\n",
-        function_fmt=lambda k, v: f"{shlex.quote(k)}() {{\n    {escape_function_body(v)}\n}}\n",
+        alias_tmpl="Set-Alias -Name {k} -Value {v}\n",
+        env_tmpl="$env:{k} = {v}\n",
+        func_tmpl="function {k} {{ {b} }}\n",
     ),
+    "oil": _POSIX_SYNTAX,
+    "default": _POSIX_SYNTAX,
 }
 
+# Read-only view of the table; the syntaxes are shared, so nothing may
+# replace or add entries at runtime
+SHELLS = MappingProxyType(_SHELLS)
+
 
 def get_supported_shells():
     """Return list of supported shell names (excluding default)"""
@@ -145,4 +196,4 @@ def get_supported_shells():
 
 def get_shell_syntax(shell_name):
     """Get syntax for a specific shell, falling back to default"""
-    return SHELLS.get(shell_name, SHELLS["default"])
+    return _SHELLS.get(shell_name, _POSIX_SYNTAX)
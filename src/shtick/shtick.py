@@ -4,7 +4,9 @@ High-level API for shtick - provides a clean programmatic interface
 
 import os
 import logging
-from typing import List, Dict, Optional, Union, Tuple
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Iterator, List, Dict, Optional, Set, Union, Tuple
 from .config import Config, GroupData
 from .generator import Generator
 from .security import validate_key, validate_value
@@ -30,6 +32,13 @@ class ShtickManager:
         >>> status = manager.get_status()
         >>> print(status['active_groups'])
         ['work']
+
+        Group several changes so the config is saved and shell files are
+        regenerated once, when the block exits:
+
+        >>> with manager.batch():
+        ...     manager.add_alias('gs', 'git status', 'dev')
+        ...     manager.add_env('EDITOR', 'vim', 'dev')
     """
 
     def __init__(self, config_path: Optional[str] = None, debug: bool = False):
@@ -51,11 +60,17 @@ class ShtickManager:
         self._config = None
         self._generator = Generator()
 
+        # Deferred save/regenerate state while inside batch()
+        self._batch_depth = 0
+        self._batch_pending = False
+        self._batch_regenerate_all = False
+        self._dirty_groups: Set[str] = set()
+
     def _load_config(self, create_if_missing: bool = True) -> Config:
         """Load or reload the configuration"""
         try:
             config = Config(self.config_path)
-            config.load()
+            config.load_deferred()
             self._config = config
             return config
         except FileNotFoundError:
@@ -76,13 +91,72 @@ class ShtickManager:
             return self._load_config()
         return self._config
 
+    @contextmanager
+    def batch(self) -> Iterator["ShtickManager"]:
+        """
+        Defer saving and regeneration until the block exits.
+
+        Mutations inside the block only record which groups they touched;
+        on exit the config is saved once, shell files are regenerated for
+        those groups and the loader is rebuilt once. Batches may nest - only
+        the outermost one flushes. Changes made before an exception are
+        still saved, so memory and disk never disagree; if that save fails
+        too, it is logged and the block's own exception propagates.
+
+        Example:
+            >>> with manager.batch():
+            ...     for key, value in aliases.items():
+            ...         manager.add_alias(key, value, 'dev')
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                try:
+                    self._flush_batch()
+                except Exception as e:
+                    logger.error("Failed to save batched changes: %s", e)
+            raise
+        else:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush_batch()
+
+    def _flush_batch(self) -> None:
+        """Do the save and regeneration deferred by batch(), if any"""
+        if not self._batch_pending:
+            return
+        dirty = None if self._batch_regenerate_all else list(self._dirty_groups)
+        self._batch_pending = False
+        self._batch_regenerate_all = False
+        self._dirty_groups.clear()
+        self._save_and_regenerate(dirty)
+
     def _save_and_regenerate(self, affected_groups: Optional[List[str]] = None) -> None:
-        """Save config and regenerate shell files"""
+        """
+        Save config and regenerate shell files.
+
+        Args:
+            affected_groups: Groups whose shell files changed; only these are
+                rewritten. None means regenerate every group, while an empty
+                list regenerates none (the loader is always rebuilt).
+        """
+        if self._batch_depth:
+            # Inside batch(): remember the work and do it once on exit
+            self._batch_pending = True
+            if affected_groups is None:
+                self._batch_regenerate_all = True
+            else:
+                self._dirty_groups.update(affected_groups)
+            return
+
         config = self._get_config()
         config.save()
 
         # Regenerate shell files for affected groups
-        if affected_groups:
+        if affected_groups is not None:
             for group_name in affected_groups:
                 group = config.get_group(group_name)
                 if group:
@@ -274,9 +348,9 @@ class ShtickManager:
 
             # Use settings if check_conflicts not explicitly set
             if check_conflicts is None:
-                from .settings import Settings
+                from .settings import get_settings
 
-                settings = Settings()
+                settings = get_settings()
                 check_conflicts = settings.behavior.check_conflicts
 
             # Check for conflicts if requested
@@ -290,12 +364,10 @@ class ShtickManager:
 
             config.add_item(item_type, group_name, key, value)
 
-            # Only regenerate files for affected group if it's active
-            affected_groups = []
-            if group_name == "persistent" or config.is_group_active(group_name):
-                affected_groups.append(group_name)
-
-            self._save_and_regenerate(affected_groups)
+            # Rewrite only the touched group's files. Inactive groups are
+            # included so their files are current when they're activated,
+            # which only rebuilds the loader.
+            self._save_and_regenerate([group_name])
             return True
 
         except Exception as e:
@@ -309,12 +381,8 @@ class ShtickManager:
             success = config.remove_item(item_type, group_name, key)
 
             if success:
-                # Only regenerate if group is active
-                affected_groups = []
-                if group_name == "persistent" or config.is_group_active(group_name):
-                    affected_groups.append(group_name)
-
-                self._save_and_regenerate(affected_groups)
+                # Rewrite only the touched group's files
+                self._save_and_regenerate([group_name])
 
             return success
 
@@ -368,8 +436,7 @@ class ShtickManager:
                 results["success"].append(key)
 
                 # Track affected groups
-                if group_name == "persistent" or config.is_group_active(group_name):
-                    affected_groups.add(group_name)
+                affected_groups.add(group_name)
 
             except Exception as e:
                 logger.error(f"Failed to add item '{item.get('key', 'unknown')}': {e}")
@@ -410,8 +477,7 @@ class ShtickManager:
                     results["success"].append(key)
 
                     # Track affected groups
-                    if group_name == "persistent" or config.is_group_active(group_name):
-                        affected_groups.add(group_name)
+                    affected_groups.add(group_name)
                 else:
                     results["failed"].append(key)
 
@@ -442,7 +508,10 @@ class ShtickManager:
             config = self._get_config()
             success = config.activate_group(group)
             if success:
-                self._generator.generate_loader(config)
+                if self._batch_depth:
+                    self._batch_pending = True  # Loader is rebuilt on exit
+                else:
+                    self._generator.generate_loader(config)
             return success
         except Exception as e:
             logger.error(f"Error activating group: {e}")
@@ -462,7 +531,10 @@ class ShtickManager:
             config = self._get_config()
             success = config.deactivate_group(group)
             if success:
-                self._generator.generate_loader(config)
+                if self._batch_depth:
+                    self._batch_pending = True  # Loader is rebuilt on exit
+                else:
+                    self._generator.generate_loader(config)
             return success
         except Exception as e:
             logger.error(f"Error deactivating group: {e}")
@@ -477,7 +549,7 @@ class ShtickManager:
         """
         try:
             config = self._get_config()
-            return config.load_active_groups()
+            return list(config.load_active_groups())
         except Exception:
             return []
 
@@ -495,7 +567,7 @@ class ShtickManager:
             return []
 
     # Information and status
-    def get_status(self) -> Dict[str, Union[str, int, List[str], bool]]:
+    def get_status(self) -> Dict[str, Union[str, int, List[str], Dict[str, int], bool]]:
         """
         Get current shtick status.
 
@@ -511,8 +583,8 @@ class ShtickManager:
             current_shell = Config.get_current_shell() or ""
             loader_exists = False
             if current_shell:
-                loader_path = os.path.expanduser(
-                    f"~/.config/shtick/load_active.{current_shell}"
+                loader_path = os.path.join(
+                    Config.get_output_dir(), f"load_active.{current_shell}"
                 )
                 loader_exists = os.path.exists(loader_path)
 
@@ -523,8 +595,9 @@ class ShtickManager:
                 "loader_exists": loader_exists,
                 "persistent_items": persistent_count,
                 "total_groups": len(regular_groups),
-                "active_groups": active_groups,
+                "active_groups": list(active_groups),
                 "available_groups": [g.name for g in regular_groups],
+                "items_per_group": {g.name: g.total_items for g in regular_groups},
                 "config_path": self.config_path,
             }
         except Exception as e:
@@ -536,6 +609,7 @@ class ShtickManager:
                 "total_groups": 0,
                 "active_groups": [],
                 "available_groups": [],
+                "items_per_group": {},
                 "config_path": self.config_path,
             }
 
@@ -551,24 +625,29 @@ class ShtickManager:
         """
         try:
             config = self._get_config()
-            items = []
+            items: List[Dict[str, Any]] = []
 
             groups_to_check = [config.get_group(group)] if group else config.groups
             groups_to_check = [g for g in groups_to_check if g is not None]
 
+            append = items.append
             for g in groups_to_check:
-                # Process each item type
-                for item_type in ["alias", "env", "function"]:
-                    item_dict = g.get_items(item_type)
+                # Group-level fields are the same for every item in the group
+                name = g.name
+                active = name == "persistent" or config.is_group_active(name)
+                for item_type, item_dict in (
+                    ("alias", g.aliases),
+                    ("env", g.env_vars),
+                    ("function", g.functions),
+                ):
                     for key, value in item_dict.items():
-                        items.append(
+                        append(
                             {
-                                "group": g.name,
+                                "group": name,
                                 "type": item_type,
                                 "key": key,
                                 "value": value,
-                                "active": config.is_group_active(g.name)
-                                or g.name == "persistent",
+                                "active": active,
                             }
                         )
 
@@ -577,6 +656,29 @@ class ShtickManager:
             logger.error(f"Error listing items: {e}")
             return []
 
+    def find_items(
+        self, item_type: str, group: str, search: str, limit: Optional[int] = None
+    ) -> List[str]:
+        """
+        Find item keys in a group that fuzzy-match a search term.
+
+        Args:
+            item_type: Item type ('alias', 'env' or 'function')
+            group: Group name to search
+            search: Case-insensitive substring to look for
+            limit: Stop after this many matches (None for all)
+
+        Returns:
+            List of matching item keys
+        """
+        try:
+            config = self._get_config()
+            matches = config.iter_matching_items(item_type, group, search)
+            return list(islice(matches, limit))
+        except Exception as e:
+            logger.error(f"Error finding items: {e}")
+            return []
+
     def generate_shell_files(self) -> bool:
         """
         Regenerate all shell files.
@@ -695,8 +797,8 @@ class ShtickManager:
             if not current_shell:
                 return None
 
-            loader_path = os.path.expanduser(
-                f"~/.config/shtick/load_active.{current_shell}"
+            loader_path = os.path.join(
+                Config.get_output_dir(), f"load_active.{current_shell}"
             )
             if os.path.exists(loader_path):
                 return f"source {loader_path}"
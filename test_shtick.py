@@ -18,6 +18,113 @@ YELLOW = "\033[1;33m"
 NC = "\033[0m"  # No Color
 
 
+# Exercises the pickle sidecar next to the default config: a warm load must
+# skip TOML parsing, save() must drop the sidecar, a changed file must miss,
+# and configs elsewhere or sidecars others can write must never be used
+PARSE_CACHE_SCRIPT = """
+import os, tempfile, tomllib
+import shtick.config as c
+from shtick.config import Config
+
+c._toml_fast = None
+parses = []
+real_loads = tomllib.loads
+def counting_loads(text):
+    parses.append(1)
+    return real_loads(text)
+c.tomllib.loads = counting_loads
+
+def fresh_load(path):
+    Config._parsed_cache.clear()
+    config = Config(path)
+    config.load()
+    return config
+
+path = Config.get_default_config_path()
+sidecar = path + ".cache"
+config = fresh_load(path)
+assert os.path.exists(sidecar), "sidecar not written"
+assert os.stat(sidecar).st_mode & 0o777 == 0o600, "sidecar not private"
+
+n = len(parses)
+fresh_load(path)
+assert len(parses) == n, "warm load parsed the TOML again"
+
+config.add_item("alias", "cachetest", "k", "v")
+config.save()
+assert not os.path.exists(sidecar), "save() left a stale sidecar"
+assert fresh_load(path).get_group("cachetest").aliases == {"k": "v"}
+assert len(parses) == n + 1, "changed config did not miss the cache"
+
+os.chmod(sidecar, 0o666)
+fresh_load(path)
+assert len(parses) == n + 2, "group/world-writable sidecar was trusted"
+
+other = os.path.join(tempfile.mkdtemp(dir=os.environ["HOME"]), "team.toml")
+with open(other, "w") as f:
+    f.write("[team.aliases]\\nx = \\"y\\"\\n")
+fresh_load(other)
+assert not os.path.exists(other + ".cache"), "sidecar written for custom path"
+"""
+
+# ShtickManager.batch(): one save and one regeneration of just the touched
+# groups on exit, nothing flushed by an inner batch, and the body's
+# exception wins over a failing save
+BATCH_SCRIPT = """
+import glob, os
+from shtick import ShtickManager
+from shtick.config import Config
+
+manager = ShtickManager()
+manager.add_alias("untouched", "true", "other")
+
+saves = []
+real_save = Config.save
+def counting_save(self):
+    saves.append(1)
+    return real_save(self)
+Config.save = counting_save
+
+regenerated = []
+generator = manager._generator
+real_generate = generator.generate_for_group
+def tracking_generate(group):
+    regenerated.append(group.name)
+    return real_generate(group)
+generator.generate_for_group = tracking_generate
+
+with manager.batch():
+    for i in range(5):
+        assert manager.add_alias(f"b{i}", "echo hi", "batchone")
+    with manager.batch():
+        assert manager.add_env("BATCHVAR", "1", "batchtwo")
+    assert saves == [], "inner batch flushed early"
+    assert regenerated == [], "regenerated inside the batch"
+
+assert saves == [1], f"expected one save, got {len(saves)}"
+assert sorted(regenerated) == ["batchone", "batchtwo"], regenerated
+out_dir = Config.get_output_dir()
+for group in ("batchone", "batchtwo"):
+    assert glob.glob(os.path.join(out_dir, group, "all.*")), f"no files for {group}"
+
+fresh = ShtickManager()
+assert len(fresh.list_items("batchone")) == 5
+assert len(fresh.list_items("batchtwo")) == 1
+
+def failing_save(self):
+    raise OSError("disk full")
+Config.save = failing_save
+try:
+    with manager.batch():
+        manager.add_alias("late", "true", "batchone")
+        raise KeyError("body error")
+except KeyError:
+    pass
+else:
+    raise AssertionError("body exception was replaced or swallowed")
+"""
+
+
 class ShtickTester:
     def __init__(self):
         self.tests_run = 0
@@ -169,6 +276,36 @@ interactive_mode = false
             print(f"  Output: {output[:500]}...")  # Truncate long output
             self.tests_failed += 1
 
+    def test_script(self, test_name, code, description):
+        """Run a Python snippet against the shtick API; it passes if it exits 0"""
+        self.tests_run += 1
+
+        print(f"[{self.tests_run}] {test_name}: {description} ... ", end="", flush=True)
+
+        env = os.environ.copy()
+        env["HOME"] = self.test_dir
+        env["SHTICK_ORIGINAL_HOME"] = self.original_home
+        try:
+            result = subprocess.run(
+                [sys.executable, "-c", code],
+                capture_output=True,
+                text=True,
+                env=env,
+                timeout=10,
+            )
+            output, status = result.stdout + result.stderr, result.returncode
+        except subprocess.TimeoutExpired:
+            output, status = "Script timed out", -1
+
+        if status == 0:
+            print(f"{GREEN}PASS{NC}")
+            self.tests_passed += 1
+        else:
+            print(f"{RED}FAIL{NC}")
+            print(f"  Status: {status}")
+            print(f"  Output: {output[-1000:]}")
+            self.tests_failed += 1
+
     def verify_shtick(self):
         """Verify shtick command is working"""
         print("Verifying shtick command...")
@@ -397,10 +534,45 @@ interactive_mode = false
             self.test_command(
                 "list-long-format", ["list", "-l"], 0, "List in long format"
             )
+            self.test_command(
+                "list-limit",
+                ["list", "--limit", "1"],
+                0,
+                "List capped with --limit",
+                check_output="use --all to see all",
+            )
+            self.test_command(
+                "list-limit-zero",
+                ["list", "--limit", "0"],
+                0,
+                "List capped at zero still summarizes",
+                check_output="Total:",
+            )
+            self.test_command(
+                "list-limit-negative",
+                ["list", "--limit", "-1"],
+                2,
+                "Negative --limit is rejected",
+                check_output="must be 0 or more",
+            )
             self.test_command(
                 "status-with-content", ["status"], 0, "Status with configuration"
             )
 
+            # Test 11b: Parse cache sidecar
+            print(f"\n{YELLOW}Testing config parse cache:{NC}")
+            self.test_script(
+                "parse-cache",
+                PARSE_CACHE_SCRIPT,
+                "Sidecar hit, miss, invalidation and untrusted paths",
+            )
+
+            self.test_script(
+                "manager-batch",
+                BATCH_SCRIPT,
+                "batch() saves once and regenerates touched groups",
+            )
+
             # Test 12: Conflict handling
             print(f"\n{YELLOW}Testing conflict handling:{NC}")
             # First create an alias in persistent